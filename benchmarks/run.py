@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Benchmarks for BusinessTime and the holiday providers.
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --compare results.json
+
+Each benchmark reports the best time per call out of several repeats, so
+runs of the same code on the same machine are comparable. Results are
+written as JSON; --compare prints how much slower or faster every benchmark
+got relative to an earlier results file.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import businesstime  # noqa: E402
+from businesstime import BusinessTime  # noqa: E402
+from businesstime.holidays.aus import (  # noqa: E402
+    BrisbanePublicHolidays, QueenslandPublicHolidays)
+from businesstime.holidays.uk import (  # noqa: E402
+    EnglandHolidays, NorthernIrelandHolidays, ScotlandHolidays,
+    WalesHolidays)
+from businesstime.holidays.usa import USFederalHolidays  # noqa: E402
+
+# (name, class, first year, last year) for every holiday provider
+PROVIDERS = [
+    ('us', USFederalHolidays, 1970, 2069),
+    ('england', EnglandHolidays, 2012, 2019),
+    ('wales', WalesHolidays, 2012, 2019),
+    ('scotland', ScotlandHolidays, 2012, 2019),
+    ('northern-ireland', NorthernIrelandHolidays, 2012, 2019),
+    ('queensland', QueenslandPublicHolidays, 2013, 2019),
+    ('brisbane', BrisbanePublicHolidays, 2013, 2019),
+]
+
+SPANS = [
+    ('1h', datetime.timedelta(hours=1)),
+    ('1d', datetime.timedelta(days=1)),
+    ('1w', datetime.timedelta(weeks=1)),
+    ('1m', datetime.timedelta(days=30)),
+    ('1y', datetime.timedelta(days=365)),
+    ('10y', datetime.timedelta(days=3652)),
+    ('30y', datetime.timedelta(days=10957)),
+]
+
+START = datetime.datetime(2014, 1, 16, 11, 17)
+
+
+def dense_holidays(every):
+    """
+    A holiday list with every n-th day from 1990 to 2050 as a holiday
+    """
+    first = datetime.date(1990, 1, 1).toordinal()
+    last = datetime.date(2050, 1, 1).toordinal()
+    return [
+        datetime.date.fromordinal(ordinal)
+        for ordinal in range(first, last, every)
+    ]
+
+
+def calendars():
+    """
+    (name, factory) pairs for calendars of increasing holiday density
+    """
+    return [
+        ('no-holidays', lambda: BusinessTime()),
+        ('us-provider', lambda: BusinessTime(holidays=USFederalHolidays())),
+        ('list-1-in-30', lambda: BusinessTime(holidays=dense_holidays(30))),
+        ('list-1-in-3', lambda: BusinessTime(holidays=dense_holidays(3))),
+    ]
+
+
+def benchmarks(quick):
+    """
+    Yields (name, setup, statement) for every benchmark. setup() is run once
+    and returns the argument passed to statement on every call.
+    """
+    spans = SPANS[:4] if quick else SPANS
+
+    for calendar_name, factory in calendars():
+        list_holidays = calendar_name.startswith('list')
+        for span_name, span in spans:
+            end = START + span
+            name = '%s/%s' % (calendar_name, span_name)
+
+            def warm(factory=factory, end=end):
+                bt = factory()
+                bt.businesstimedelta(START, end)
+                return bt
+
+            yield ('businesstimedelta/warm/' + name, warm,
+                   lambda bt, end=end: bt.businesstimedelta(START, end))
+            yield ('businesstime_hours/warm/' + name, warm,
+                   lambda bt, end=end: bt.businesstime_hours(START, end))
+            yield ('iterbusinessdays/warm/' + name, warm,
+                   lambda bt, end=end: list(bt.iterbusinessdays(START, end)))
+            if not list_holidays:
+                # a cold cache only means something for generated holidays
+                yield ('businesstimedelta/cold/' + name, lambda: factory,
+                       lambda factory, end=end: factory().businesstimedelta(
+                           START, end))
+
+        def replay(factory=factory):
+            bt = factory()
+            pairs = [(START + datetime.timedelta(minutes=37 * i),
+                      START + datetime.timedelta(minutes=37 * i, days=730))
+                     for i in range(1000)]
+            bt.businesstimedelta(START, pairs[-1][1])
+            return bt, pairs
+
+        yield ('businesstimedelta/replay-2y-1000/' + calendar_name, replay,
+               lambda arg: [arg[0].businesstimedelta(d1, d2)
+                            for d1, d2 in arg[1]])
+        yield ('iter_businesstimedelta/replay-2y-1000/' + calendar_name, replay,
+               lambda arg: list(arg[0].iter_businesstimedelta(arg[1])))
+
+        def warm(factory=factory):
+            bt = factory()
+            bt.isduringbusinesshours(START)
+            return bt
+
+        yield ('isduringbusinesshours/warm/' + calendar_name, warm,
+               lambda bt: bt.isduringbusinesshours(START))
+
+    for provider_name, cls, first_year, last_year in PROVIDERS:
+        if quick:
+            last_year = min(last_year, first_year + 4)
+        first = datetime.date(first_year, 1, 1)
+        last = datetime.date(last_year + 1, 1, 1)
+        name = '%s/%d-%d' % (provider_name, first_year, last_year)
+
+        def warm(cls=cls, first=first, last=last):
+            holidays = cls()
+            list(holidays(first, last))
+            return holidays
+
+        yield ('holidays/cold/' + name, lambda cls=cls: cls,
+               lambda cls, first=first, last=last: list(cls()(first, last)))
+        yield ('holidays/warm/' + name, warm,
+               lambda holidays, first=first, last=last: list(
+                   holidays(first, last)))
+        yield ('isholiday/warm/' + provider_name, warm,
+               lambda holidays, first=first: holidays.isholiday(first))
+
+
+def time_benchmark(setup, statement, repeat, min_time):
+    arg = setup()
+    timer = timeit.Timer(lambda: statement(arg))
+    # Timer.autorange is Python 3.6+, so calibrate by hand
+    number = 1
+    elapsed = timer.timeit(number)
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    times = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    return {
+        'best': min(times) / number,
+        'mean': sum(times) / len(times) / number,
+        'calls': number,
+    }
+
+
+def compare(previous, current):
+    for name in sorted(current):
+        if name not in previous:
+            print('%-60s %12s' % (name, 'new'))
+            continue
+        ratio = current[name]['best'] / previous[name]['best']
+        print('%-60s %11.2fx %s' % (name, ratio, 'slower'
+                                    if ratio > 1 else 'faster'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-o', '--output', help='write results JSON here')
+    parser.add_argument(
+        '--compare', help='results JSON from an earlier run to compare with')
+    parser.add_argument(
+        '-k', '--filter', default='', help='only run benchmarks containing this')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=0.05,
+        help='minimum seconds per repeat')
+    parser.add_argument(
+        '--quick',
+        action='store_true',
+        help='skip the longest spans and year ranges')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup, statement in benchmarks(args.quick):
+        if args.filter not in name:
+            continue
+        results[name] = time_benchmark(setup, statement, args.repeat,
+                                       args.min_time)
+        print('%-60s %12.3f us' % (name, results[name]['best'] * 1e6))
+        sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'version': businesstime.__version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'machine': platform.machine(),
+                'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f)['results'], results)
+
+
+if __name__ == '__main__':
+    main()
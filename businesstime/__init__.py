@@ -1,60 +1,354 @@
 import datetime
 
+from businesstime import stats
+from businesstime.clock import BusinessClock
+from businesstime.index import BusinessDayIndex
+from businesstime.registry import CalendarRegistry, calendar_key
+from businesstime.schedule import (DayHours, Schedule, _time_to_microseconds,
+                                   combine_hours)
+from businesstime.store import FrozenDateSet, HolidayYearCache, SortedDateSet
+
 __version__ = "0.3.0"
 
+# Calendars handed out by BusinessTime.shared; set maxsize to change how
+# many configurations are kept
+shared_calendars = CalendarRegistry()
+
+MICROSECONDS_PER_DAY = 86400 * 1000000
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
 
-class BusinessTime(object):
+def _weekend_model(weekends):
     """
-    BusinessTime is essentially a calendar that can be queried for
-    business time aware timedeltas between two datetimes.
+    (bitmask, predicate) for a weekends argument: either weekday numbers,
+    giving a bitmask with bit n set when weekday n is a weekend and no
+    predicate, or a callable taking a date and returning True for rest days
     """
+    if callable(weekends):
+        return 0, weekends
+    mask = 0
+    for weekday in weekends:
+        mask |= 1 << weekday
+    return mask, None
 
-    def __init__(self, business_hours=None, weekends=(5, 6), holidays=None):
-        if business_hours is None:
-            business_hours = (datetime.time(9), datetime.time(17))
-        self.business_hours = business_hours
 
-        # TODO: weekends should maybe be a generator or a callable returning True/False
-        self.weekends = weekends
+def _isuniform(schedule, weekendmask, weekendpredicate):
+    """
+    True when every business day has schedule.day_length of business hours,
+    so business time is a whole number of days times that length
+    """
+    if schedule.exceptions:
+        return False
+    return all(hours.length == schedule.day_length
+               for weekday, hours in enumerate(schedule.weekdays)
+               if weekendpredicate is not None or
+               not weekendmask >> weekday & 1)
 
-        self.holidays = holidays
-        if callable(self.holidays) or self.holidays is None:
-            self._holidaysGeneratorStart = None
-            self._holidaysGenerator = None
-            self._holidays = []
-        else:
-            self._holidays = self.holidays
 
-        # HACK: pick an arbitrary date so we can do math with datetime.time objects
-        arbitrary_date = datetime.datetime(2014, 1, 26)
-        start = datetime.datetime.combine(arbitrary_date, business_hours[0])
-        end = datetime.datetime.combine(arbitrary_date, business_hours[1])
-        self.open_hours = end - start
+def _weekday_of_ordinal(ordinal):
+    # date.fromordinal(1) is a Monday
+    return (ordinal - 1) % 7
+
+
+def _split_timestamp(timestamp):
+    """
+    (date ordinal, microseconds into the day) for a POSIX timestamp in UTC
+    """
+    if isinstance(timestamp, float):
+        microseconds = int(round(timestamp * 1000000))
+    else:
+        microseconds = timestamp * 1000000
+    days, microseconds = divmod(microseconds, MICROSECONDS_PER_DAY)
+    return EPOCH_ORDINAL + days, microseconds
+
+
+def _whole_seconds(microseconds):
+    # Truncates towards zero, like int(timedelta.total_seconds())
+    seconds = abs(microseconds) // 1000000
+    return seconds if microseconds >= 0 else -seconds
+
+
+def _from_ordinal(ordinal, microseconds, tzinfo=None):
+    return datetime.datetime.fromordinal(ordinal).replace(
+        tzinfo=tzinfo) + datetime.timedelta(microseconds=microseconds)
+
+
+class BaseBusinessTime(object):
+    """
+    The queries shared by BusinessTime and the read-only calendars. Subclasses
+    provide business_hours, weekends, holidays, open_hours, _schedule (a
+    Schedule), _day_length (its day_length), _uniform (from _isuniform),
+    _weekendmask and _weekendpredicate (from _weekend_model), _holidays (a
+    collection of dates supporting `in` and between(start, end)) and _index.
+    """
+
+    __slots__ = ()
 
     def isweekend(self, dt):
-        return dt.weekday() in self.weekends
+        if self._weekendpredicate is not None:
+            return bool(self._weekendpredicate(dt))
+        return self._weekendmask >> dt.weekday() & 1 == 1
 
-    def _ensure_holidays_span_datetime(self, dt):
-        if callable(self.holidays):
-            if self._holidaysGeneratorStart is None or dt < self._holidaysGeneratorStart:
-                self._holidaysGeneratorStart = dt
-                self._holidays = []
-                self._holidaysGenerator = self.holidays(dt)
-            while len(self._holidays) == 0 or dt > self._holidays[-1]:
-                self._holidays.append(next(self._holidaysGenerator))
+    def _count_weekdays(self, first, last):
+        """
+        Number of days in first <= x < last, both given as ordinals, that are
+        not weekends. With weekday-number weekends this is arithmetic: full
+        weeks times the working weekdays per week, plus the remainder.
+        """
+        if last <= first:
+            return 0
+        if self._weekendpredicate is not None:
+            return sum(1 for ordinal in range(first, last)
+                       if not self.isweekend(datetime.date.fromordinal(ordinal)))
+        weeks, extra = divmod(last - first, 7)
+        workdays = ~self._weekendmask & 0x7f
+        # Repeat the week's bits so the remainder can wrap past Sunday
+        remainder = (workdays | workdays << 7) >> _weekday_of_ordinal(first)
+        return (weeks * bin(workdays).count('1') +
+                bin(remainder & ((1 << extra) - 1)).count('1'))
 
     def isholiday(self, dt):
         if type(dt) == datetime.datetime:
             dt = dt.date()
-        self._ensure_holidays_span_datetime(dt)
         return dt in self._holidays
 
     def isbusinessday(self, dt):
         return not self.isweekend(dt) and not self.isholiday(dt)
 
+    def holidays_between(self, start, end):
+        """
+        Sorted list of this calendar's holidays in start <= x < end.
+        Datetimes are truncated to their date.
+        """
+        if isinstance(start, datetime.datetime):
+            start = start.date()
+        if isinstance(end, datetime.datetime):
+            end = end.date()
+        return list(self._holidays.between(start, end))
+
+    def holiday_cache_info(self):
+        """
+        Hit and miss counts of the per-year holiday cache, or None when
+        holidays is not a callable
+        """
+        if isinstance(self._holidays, HolidayYearCache):
+            return self._holidays.cache_info()
+        return None
+
+    def _isbusinessordinal(self, ordinal):
+        if self._index is not None and self._index.covers(ordinal, ordinal + 1):
+            return self._index.isbusinessday(ordinal)
+        return self.isbusinessday(datetime.date.fromordinal(ordinal))
+
+    def _count_businessdays(self, first, last):
+        """
+        Number of business days in first <= x < last, both given as ordinals,
+        without visiting every day in between
+        """
+        if self._index is not None and self._index.covers(first, last):
+            return self._index.count(first, last)
+        count = self._count_weekdays(first, last)
+        if self.holidays is not None and last > first:
+            start = datetime.date.fromordinal(first)
+            end = datetime.date.fromordinal(last)
+            count -= sum(1 for holiday in self._holidays.between(start, end)
+                         if not self.isweekend(holiday))
+        return count
+
+    def _business_length(self, first, last):
+        """
+        Business microseconds in the whole days first <= x < last, both
+        given as ordinals: each weekday's hours times the number of times it
+        occurs, less holidays, adjusted for dates with exceptional hours
+        """
+        if self._uniform:
+            return self._count_businessdays(first, last) * self._day_length
+        if last <= first:
+            return 0
+        weekdays = self._schedule.weekdays
+        if self._weekendpredicate is not None:
+            total = sum(weekdays[_weekday_of_ordinal(ordinal)].length
+                        for ordinal in range(first, last)
+                        if not self.isweekend(
+                            datetime.date.fromordinal(ordinal)))
+        else:
+            weeks, extra = divmod(last - first, 7)
+            total = 0
+            for weekday, hours in enumerate(weekdays):
+                if not self._weekendmask >> weekday & 1:
+                    offset = (weekday - _weekday_of_ordinal(first)) % 7
+                    total += hours.length * (weeks + (offset < extra))
+        holidays = set()
+        if self.holidays is not None:
+            for holiday in self._holidays.between(
+                    datetime.date.fromordinal(first),
+                    datetime.date.fromordinal(last)):
+                if not self.isweekend(holiday):
+                    total -= weekdays[holiday.weekday()].length
+                    holidays.add(holiday.toordinal())
+        for ordinal in self._schedule.exceptions_between(first, last):
+            if ordinal not in holidays and not self.isweekend(
+                    datetime.date.fromordinal(ordinal)):
+                total += (self._schedule.exceptions[ordinal].length -
+                          weekdays[_weekday_of_ordinal(ordinal)].length)
+        return total
+
+    def _nth_businessday(self, ordinal, n, direction=1):
+        """
+        Ordinal of the n-th business day counting from ordinal (inclusive),
+        forwards when direction is 1 and backwards when it is -1
+        """
+        if self._index is not None:
+            day = self._index.nth(ordinal, n, direction)
+            if day is not None:
+                return day
+        if self._weekendpredicate is not None:
+            # No arithmetic shortcut for arbitrary rest days
+            day = ordinal
+            while True:
+                if self._isbusinessordinal(day):
+                    n -= 1
+                    if n == 0:
+                        return day
+                day += direction
+        per_week = bin(~self._weekendmask & 0x7f).count('1')
+        if per_week == 0:
+            raise ValueError("every day of the week is a weekend")
+        # Jump whole weeks at a time, counting business days arithmetically,
+        # until the span holds the n-th business day
+        while True:
+            span = -(-n // per_week) * 7
+            if direction > 0:
+                first, last = ordinal, ordinal + span
+            else:
+                first, last = ordinal - span + 1, ordinal + 1
+            count = self._count_businessdays(first, last)
+            if count >= n:
+                break
+            n -= count
+            ordinal += span * direction
+        # The span overshoots by fewer than a week's worth of business days,
+        # so step back in from its far end
+        surplus = count - n
+        day = last - 1 if direction > 0 else first
+        while True:
+            if self._isbusinessordinal(day):
+                if surplus == 0:
+                    return day
+                surplus -= 1
+            day -= direction
+
+    def _locate_businesstime(self, ordinal, remaining, direction=1):
+        """
+        (day, used) for the business day on which remaining microseconds of
+        business time, counted from the start of ordinal forwards or from
+        its end backwards, run out; used is the business time taken from
+        that day, 0 < used <= its length
+        """
+        if self._uniform:
+            days, elapsed = divmod(remaining - 1, self._day_length)
+            return (self._nth_businessday(ordinal, days + 1, direction),
+                    elapsed + 1)
+        if self._weekendpredicate is not None:
+            day = ordinal
+            while True:
+                length = self._business_length(day, day + 1)
+                if remaining <= length:
+                    return day, remaining
+                remaining -= length
+                day += direction
+        per_week = sum(hours.length
+                       for weekday, hours in enumerate(self._schedule.weekdays)
+                       if not self._weekendmask >> weekday & 1)
+        if per_week == 0:
+            raise ValueError("no weekday has any business hours")
+        # The same week jumping as _nth_businessday, measuring business time
+        # instead of counting days
+        while True:
+            span = -(-remaining // per_week) * 7
+            if direction > 0:
+                first, last = ordinal, ordinal + span
+            else:
+                first, last = ordinal - span + 1, ordinal + 1
+            length = self._business_length(first, last)
+            if length >= remaining:
+                break
+            remaining -= length
+            ordinal += span * direction
+        surplus = length - remaining
+        day = last - 1 if direction > 0 else first
+        while True:
+            length = self._business_length(day, day + 1)
+            if surplus < length:
+                return day, length - surplus
+            surplus -= length
+            day -= direction
+
     def isduringbusinesshours(self, dt):
-        return self.isbusinessday(dt) and self.business_hours[0] <= dt.time(
-        ) < self.business_hours[1]
+        return self.isbusinessday(dt) and self._schedule.day(
+            dt.toordinal()).isopen(_time_to_microseconds(dt.time()))
+
+    def _hasweeklyhours(self):
+        """
+        Whether any weekday that can be a business day has business hours,
+        rather than only some dates with exceptional hours
+        """
+        return any(hours.length
+                   for weekday, hours in enumerate(self._schedule.weekdays)
+                   if self._weekendpredicate is not None or
+                   not self._weekendmask >> weekday & 1)
+
+    def next_business_day(self, dt):
+        """
+        The first business day after dt's date, as a datetime at midnight
+        """
+        return _from_ordinal(self._nth_businessday(dt.toordinal() + 1, 1), 0,
+                             getattr(dt, 'tzinfo', None))
+
+    def next_business_open(self, dt):
+        """
+        dt when it is during business hours, otherwise the next time business
+        hours open
+        """
+        ordinal = dt.toordinal()
+        if self._isbusinessordinal(ordinal):
+            time = self._schedule.day(ordinal).next_open(
+                _time_to_microseconds(dt.time()))
+            if time is not None:
+                return _from_ordinal(ordinal, time, dt.tzinfo)
+        while True:
+            # One lookup however many weekends and holidays are skipped
+            ordinal = self._nth_businessday(ordinal + 1, 1)
+            hours = self._schedule.day(ordinal)
+            if hours.length:
+                return _from_ordinal(ordinal, hours.opening, dt.tzinfo)
+            # Only exceptional dates have hours, and none are left
+            if not (self._hasweeklyhours() or
+                    self._schedule.exceptions_between(
+                        ordinal + 1, datetime.date.max.toordinal() + 1)):
+                raise ValueError(
+                    "no business day after %s has business hours" % dt)
+
+    def previous_business_close(self, dt):
+        """
+        dt when it is during business hours or at a closing time, otherwise
+        the last time business hours closed before it
+        """
+        ordinal = dt.toordinal()
+        if self._isbusinessordinal(ordinal):
+            time = self._schedule.day(ordinal).previous_close(
+                _time_to_microseconds(dt.time()))
+            if time is not None:
+                return _from_ordinal(ordinal, time, dt.tzinfo)
+        while True:
+            ordinal = self._nth_businessday(ordinal - 1, 1, -1)
+            hours = self._schedule.day(ordinal)
+            if hours.length:
+                return _from_ordinal(ordinal, hours.closing, dt.tzinfo)
+            if not (self._hasweeklyhours() or
+                    self._schedule.exceptions_between(1, ordinal)):
+                raise ValueError(
+                    "no business day before %s has business hours" % dt)
 
     def iterdays(self, d1, d2):
         """
@@ -82,107 +376,563 @@ class BusinessTime(object):
         Date iterator returning dates in d1 <= x < d2, excluding weekends and holidays
         """
         assert d2 >= d1
-        if d1.date() == d2.date() and d2.time() < self.business_hours[0]:
+        if d1.date() == d2.date() and _time_to_microseconds(
+                d2.time()) < self._schedule.day(d2.toordinal()).opening:
             return
         first = True
         for dt in self.iterdays(d1, d2):
-            if first and d1.time() > self.business_hours[1]:
+            if first and _time_to_microseconds(d1.time()) > self._schedule.day(
+                    d1.toordinal()).closing:
                 first = False
                 continue
             first = False
             if not self.isweekend(dt) and not self.isholiday(dt):
                 yield dt
 
-    def _build_spanning_datetimes(self, d1, d2):
-        businessdays = list(self.iterbusinessdays(d1, d2))
-        if len(businessdays) == 0:
-            return businessdays
-
-        businessdays = [
-            datetime.datetime.combine(d, self.business_hours[0])
-            for d in businessdays
-        ]
-
-        if d1 > businessdays[0]:
-            businessdays[0] = d1
-
-        if self.isbusinessday(d2) and d2 >= datetime.datetime.combine(
-                d2, self.business_hours[0]):
-            businessdays.append(
-                datetime.datetime.combine(d2, self.business_hours[1]))
-            if d2 < businessdays[-1]:
-                businessdays[-1] = datetime.datetime.combine(
-                    businessdays[-1], d2.time())
+    def iter_business_intervals(self, d1, d2):
+        """
+        Lazily yields (open, close) datetime pairs for the business hours in
+        d1 <= x <= d2, in order, the first and last clipped to the span.
+        Runs of weekends and holidays are skipped in one jump each.
+        """
+        o1, t1 = d1.toordinal(), _time_to_microseconds(d1.time())
+        o2, t2 = d2.toordinal(), _time_to_microseconds(d2.time())
+        if (o1, t1) >= (o2, t2):
+            return
+        ordinal = o1
+        while True:
+            ordinal = self._nth_businessday(ordinal, 1)
+            if ordinal > o2:
+                return
+            hours = self._schedule.day(ordinal)
+            first = t1 if ordinal == o1 else 0
+            last = t2 if ordinal == o2 else MICROSECONDS_PER_DAY
+            for opens, closes in zip(hours.opens, hours.closes):
+                opens, closes = max(opens, first), min(closes, last)
+                if opens < closes:
+                    yield (_from_ordinal(ordinal, opens, d1.tzinfo),
+                           _from_ordinal(ordinal, closes, d1.tzinfo))
+            ordinal += 1
+
+    def _edge(self, ordinal, time):
+        """
+        (hours, elapsed) for one end of a span: the DayHours of ordinal and
+        the business time on it before time, or None on other days
+        """
+        hours = self._schedule.day(ordinal)
+        if self._isbusinessordinal(ordinal):
+            return hours, hours.elapsed(time)
+        return hours, None
+
+    @staticmethod
+    def _iswhole(edge1, t1, edge2, t2):
+        """
+        Whether a span starts and ends outside business hours
+        """
+        (hours1, elapsed1), (hours2, elapsed2) = edge1, edge2
+        return ((not elapsed1 or t1 > hours1.closing) and
+                (elapsed2 is None or t2 < hours2.opening or
+                 elapsed2 == hours2.length))
+
+    def _business_span(self, o1, t1, o2, t2):
+        """
+        (total, whole) for the business time from t1 microseconds into the
+        day with ordinal o1 to t2 into o2, which must not be earlier. total is
+        in microseconds; whole is True when the span starts and ends outside
+        business hours. Only the first and last days are looked at
+        individually; the business time of the days in between is worked out
+        arithmetically from the schedule (or, with uniform days, looked up in
+        the compiled index).
+        """
+        edge1 = hours1, elapsed1 = self._edge(o1, t1)
+        if o1 == o2:
+            elapsed2 = None if elapsed1 is None else hours1.elapsed(t2)
+            edge2 = hours1, elapsed2
+            total = 0 if elapsed1 is None else elapsed2 - elapsed1
         else:
-            if len(businessdays) == 1:
-                businessdays.append(
-                    datetime.datetime.combine(businessdays[0],
-                                              self.business_hours[1]))
-            else:
-                businessdays[-1] = datetime.datetime.combine(
-                    businessdays[-1], self.business_hours[1])
+            edge2 = hours2, elapsed2 = self._edge(o2, t2)
+            total = ((0 if elapsed1 is None else hours1.length - elapsed1) +
+                     self._business_length(o1 + 1, o2) + (elapsed2 or 0))
+        return total, self._iswhole(edge1, t1, edge2, t2)
+
+    def _signed_span(self, o1, t1, o2, t2):
+        """
+        Business microseconds from t1 into o1 to t2 into o2, negative when
+        the second is earlier
+        """
+        if (o1, t1) > (o2, t2):
+            return -self._business_span(o2, t2, o1, t1)[0]
+        return self._business_span(o1, t1, o2, t2)[0]
+
+    def _businessmicroseconds(self, d1, d2):
+        return self._signed_span(d1.toordinal(),
+                                 _time_to_microseconds(d1.time()),
+                                 d2.toordinal(),
+                                 _time_to_microseconds(d2.time()))
+
+    def _businesstimedelta(self, d1, d2):
+        """
+        businesstimedelta for d1 <= d2
+        """
+        return self._span_timedelta(*self._business_span(
+            d1.toordinal(), _time_to_microseconds(d1.time()), d2.toordinal(),
+            _time_to_microseconds(d2.time())))
 
-        return businessdays
+    def _span_timedelta(self, total, whole):
+        """
+        businesstimedelta's result for a span of total business
+        microseconds, whole as returned by _business_span
+        """
+        days, elapsed = divmod(total, self._day_length)
+        # A span from outside business hours to outside business hours has
+        # always been given as a number of days plus a full day of hours,
+        # e.g. 8:00:00 rather than 1 day
+        if total and elapsed == 0 and whole:
+            days -= 1
+            elapsed = self._day_length
+        return datetime.timedelta(days=days, microseconds=elapsed)
 
     def businesstimedelta(self, d1, d2):
         """
         Returns a datetime.timedelta with the number of full business days
         and business time between d1 and d2
         """
-
         if d1 > d2:
-            d1, d2, timedelta_direction = d2, d1, -1
-        else:
-            timedelta_direction = 1
-        businessdays = self._build_spanning_datetimes(d1, d2)
-        time = datetime.timedelta()
-
-        if len(businessdays) == 0:
-            # HACK: manually handle the case when d1 is after business hours while d2 is during
-            if self.isduringbusinesshours(d2):
-                time += d2 - datetime.datetime.combine(d2,
-                                                       self.business_hours[0])
-
-            # HACK: manually handle the case where d1 is on an earlier non-business day and d2 is after hours on a business day
-            elif not self.isbusinessday(d1) and self.isbusinessday(d2):
-                if d2.time() > self.business_hours[1]:
-                    time += datetime.datetime.combine(
-                        d2,
-                        self.business_hours[1]) - datetime.datetime.combine(
-                            d2, self.business_hours[0])
-                elif d2.time() > self.business_hours[0]:
-                    time += d2 - datetime.datetime.combine(
-                        d2, self.business_hours[0])
+            return -self._businesstimedelta(d2, d1)
+        return self._businesstimedelta(d1, d2)
 
-        else:
-            prev = None
-            current = None
-            count = 0
-            for d in businessdays:
-                if current is None:
-                    current = d
-                current = datetime.datetime.combine(d, current.time())
-                if prev is not None:
-                    if prev.date() != current.date():
-                        time += datetime.timedelta(days=1)
-                    if count == len(businessdays) - 1:
-                        if current > d:
-                            # We went too far
-                            time -= datetime.timedelta(days=1)
-                            time += self.open_hours - (current - d)
-                        else:
-                            time += d - current
-                count += 1
-                prev = current
-
-        return time * timedelta_direction
+    def iter_businesstimedelta(self, pairs):
+        """
+        Lazily yields businesstimedelta(d1, d2) for each (d1, d2) in pairs.
+        While the pairs arrive sorted by d1 they are swept with a
+        BusinessClock, so each one only measures the days its start and end
+        moved on since the previous pair. A pair starting before the one
+        before it is worked out on its own instead.
+        """
+        clock = previous = None
+        for d1, d2 in pairs:
+            if previous is not None and d1 < previous:
+                yield self.businesstimedelta(d1, d2)
+                continue
+            previous = d1
+            o1, t1 = d1.toordinal(), _time_to_microseconds(d1.time())
+            o2, t2 = d2.toordinal(), _time_to_microseconds(d2.time())
+            if clock is None:
+                clock = BusinessClock(self, o1)
+            p1, edge1 = clock.read(o1, t1, 0)
+            p2, edge2 = clock.read(o2, t2, 1)
+            if (o1, t1) <= (o2, t2):
+                yield self._span_timedelta(p2 - p1,
+                                           self._iswhole(edge1, t1, edge2, t2))
+            else:
+                yield -self._span_timedelta(
+                    p1 - p2, self._iswhole(edge2, t2, edge1, t1))
+
+    def businessseconds(self, d1, d2):
+        """
+        Whole seconds of business time between d1 and d2 as an int, negative
+        when d2 is before d1. The same amount as businesstime_hours, worked
+        out with integers only.
+        """
+        return _whole_seconds(self._businessmicroseconds(d1, d2))
+
+    def businessseconds_from_timestamps(self, ts1, ts2):
+        """
+        businessseconds for two POSIX timestamps, read as UTC like
+        datetime.utcfromtimestamp, without making datetime objects
+        """
+        o1, t1 = _split_timestamp(ts1)
+        o2, t2 = _split_timestamp(ts2)
+        return _whole_seconds(self._signed_span(o1, t1, o2, t2))
+
+    def _business_microseconds(self, delta):
+        """
+        Business time in delta, counting each of its days as a full business
+        day, the way businesstimedelta builds its result
+        """
+        direction = -1 if delta < datetime.timedelta() else 1
+        delta = abs(delta)
+        return direction * (delta.days * self._day_length +
+                            delta.seconds * 1000000 + delta.microseconds)
+
+    def add_businesstime(self, dt, delta):
+        """
+        Returns the datetime delta of business time after dt, or before it
+        when delta is negative. Each day in delta counts as one full business
+        day, so add_businesstime(d1, businesstimedelta(d1, d2)) lands on d2
+        or, when d2 is outside business hours, on the closest business moment
+        before it.
+        """
+        remaining = self._business_microseconds(delta)
+        if remaining == 0:
+            return dt
+        ordinal, time = dt.toordinal(), _time_to_microseconds(dt.time())
+        hours = self._schedule.day(ordinal)
+        elapsed = hours.elapsed(time) if self.isbusinessday(dt) else None
+
+        if remaining > 0:
+            if elapsed is not None:
+                if remaining <= hours.length - elapsed:
+                    return _from_ordinal(ordinal,
+                                         hours.time_at(elapsed + remaining),
+                                         dt.tzinfo)
+                remaining -= hours.length - elapsed
+            day, used = self._locate_businesstime(ordinal + 1, remaining)
+            return _from_ordinal(day,
+                                 self._schedule.day(day).time_at(used),
+                                 dt.tzinfo)
+
+        remaining = -remaining
+        if elapsed is not None:
+            if remaining <= elapsed:
+                return _from_ordinal(
+                    ordinal, hours.time_at(elapsed - remaining, latest=True),
+                    dt.tzinfo)
+            remaining -= elapsed
+        day, used = self._locate_businesstime(ordinal - 1, remaining, -1)
+        hours = self._schedule.day(day)
+        return _from_ordinal(day,
+                             hours.time_at(hours.length - used, latest=True),
+                             dt.tzinfo)
+
+    def add_businesstime_many(self, dts, deltas):
+        """
+        Vectorized add_businesstime over arrays (or sequences) of datetimes
+        and timedeltas. Returns a NumPy datetime64[us] array. Needs numpy.
+        """
+        from businesstime import vectorized
+        return vectorized.add_businesstime_many(self, dts, deltas)
+
+    def businesstimedelta_many(self, starts, ends):
+        """
+        Vectorized businesstimedelta over arrays (or sequences) of datetimes.
+        Returns an int64 NumPy array with the total seconds of each
+        businesstimedelta(start, end). Needs numpy.
+        """
+        from businesstime import vectorized
+        return vectorized.businesstimedelta_many(self, starts, ends)
+
+    def businesstime_hours_many(self, starts, ends):
+        """
+        Vectorized businesstime_hours over arrays (or sequences) of datetimes.
+        Returns an int64 NumPy array of business seconds. Needs numpy.
+        """
+        from businesstime import vectorized
+        return vectorized.businesstime_hours_many(self, starts, ends)
 
     def businesstime_hours(self, d1, d2):
         """
         Returns a datetime.timedelta of business hours between d1 and d2,
-        based on the length of the businessday 
+        counting every full business day as open_hours
+        """
+        return datetime.timedelta(
+            microseconds=self._businessmicroseconds(d1, d2))
+
+
+class BusinessTime(BaseBusinessTime):
+    """
+    BusinessTime is essentially a calendar that can be queried for
+    business time aware timedeltas between two datetimes.
+    """
+
+    def __init__(self,
+                 business_hours=None,
+                 weekends=(5, 6),
+                 holidays=None,
+                 holiday_cache_size=128):
+        if business_hours is None:
+            business_hours = (datetime.time(9), datetime.time(17))
+        self.business_hours = business_hours
+
+        # weekends is either weekday numbers (Monday is 0) or a callable
+        # returning True for dates that are rest days
+        self.weekends = weekends
+        self._weekendmask, self._weekendpredicate = _weekend_model(weekends)
+
+        self.holidays = holidays
+        if callable(self.holidays):
+            # holiday_cache_size is how many years of holidays to keep
+            self._holidays = HolidayYearCache(self.holidays,
+                                              holiday_cache_size)
+        else:
+            self._holidays = SortedDateSet(self.holidays or ())
+
+        # business_hours is either an (open, close) pair or a Schedule
+        self._schedule = Schedule.from_business_hours(business_hours)
+        self._day_length = self._schedule.day_length
+        # Hours on weekends alone would never count
+        if self._day_length <= 0 or not (self._hasweeklyhours() or any(
+                hours.length
+                for ordinal, hours in self._schedule.exceptions.items()
+                if not self.isweekend(datetime.date.fromordinal(ordinal)))):
+            raise ValueError("business hours must not be empty")
+        self._uniform = _isuniform(self._schedule, self._weekendmask,
+                                   self._weekendpredicate)
+        self.open_hours = datetime.timedelta(microseconds=self._day_length)
+
+        self._index = None
+        self._stats = None
+
+    @classmethod
+    def shared(cls,
+               business_hours=None,
+               weekends=(5, 6),
+               holidays=None,
+               holiday_cache_size=128):
+        """
+        A read-only SharedCalendar over a BusinessTime configured with these
+        arguments, shared by every caller in the process that asks for the
+        same configuration, so they use one holiday cache between them. It
+        has none of BusinessTime's mutators (enable_stats, compile_index and
+        so on), so no caller can change it under the others. Holiday
+        providers of the same class and settings count as the same; other
+        callables only match themselves. Use invalidate_shared after
+        changing what a provider returns.
+        """
+        return shared_calendars.get(
+            calendar_key(cls, business_hours, weekends, holidays,
+                         holiday_cache_size),
+            lambda: SharedCalendar(
+                cls(business_hours, weekends, holidays, holiday_cache_size)))
+
+    @classmethod
+    def invalidate_shared(cls,
+                          business_hours=None,
+                          weekends=(5, 6),
+                          holidays=None,
+                          holiday_cache_size=128):
+        """
+        Forget the shared calendar for this configuration, if there is one
+        """
+        shared_calendars.invalidate(
+            calendar_key(cls, business_hours, weekends, holidays,
+                         holiday_cache_size))
+
+    def compile_index(self, start, end):
+        """
+        Precompute a business day bitmap for dates in start <= x <= end.
+        Business days in spans inside that range are then counted with a
+        pair of popcounts instead of being worked out from the weekends and
+        holidays.
+        """
+        self._index = BusinessDayIndex(self, start, end)
+        return self._index
+
+    def freeze(self, start, end):
         """
-        open_hours = self.open_hours.seconds / 3600
-        btd = self.businesstimedelta(d1, d2)
-        btd_hours = btd.seconds / 3600
-        return datetime.timedelta(hours=(btd.days * open_hours + btd_hours))
+        Returns a CompiledCalendar with this calendar's holidays and business
+        days for start <= x <= end worked out up front. It answers the same
+        queries without changing any state, so one instance can be shared
+        between threads.
+        """
+        return CompiledCalendar(self, start, end)
+
+    def enable_stats(self, hook=None):
+        """
+        Start counting calls to, and time spent in, this calendar's query
+        methods, along with the days its iterators yield and the holiday
+        cache's hits, misses and evictions. hook, if given, is called as
+        hook(method_name, elapsed_seconds, args) after every query.
+        """
+        self.disable_stats()
+        self._stats = stats.Stats(hook)
+        stats.instrument(self, self._stats)
+
+    def disable_stats(self):
+        stats.uninstrument(self)
+        self._stats = None
+
+    def reset_stats(self):
+        if self._stats is not None:
+            self._stats = stats.Stats(self._stats.hook)
+            stats.instrument(self, self._stats)
+        if isinstance(self._holidays, HolidayYearCache):
+            self._holidays.hits = self._holidays.misses = 0
+            self._holidays.evictions = 0
+
+    def stats(self):
+        """
+        Dict of the counters collected since enable_stats or reset_stats, or
+        None when stats are disabled
+        """
+        if self._stats is None:
+            return None
+        result = self._stats.as_dict()
+        if isinstance(self._holidays, HolidayYearCache):
+            info = self._holidays.cache_info()
+            result['holiday_cache'] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'evictions': self._holidays.evictions,
+                'years': info.currsize,
+            }
+        return result
+
+
+class ReadOnlyCalendar(BaseBusinessTime):
+    """
+    Base for calendars whose attributes are set once, on construction, so
+    that one instance can be shared between threads
+    """
+
+    __slots__ = ('business_hours', 'weekends', 'holidays', 'open_hours',
+                 '_schedule', '_day_length', '_uniform', '_weekendmask',
+                 '_weekendpredicate', '_holidays', '_index')
+
+    def _assign(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def _assign_calendar(self, business_hours, weekends, holidays, schedule,
+                         dates, index):
+        """
+        Set the attributes BaseBusinessTime reads, working out the ones
+        that follow from the schedule and weekends. dates is the collection
+        of holidays the queries use.
+        """
+        weekendmask, weekendpredicate = _weekend_model(weekends)
+        self._assign(
+            business_hours=business_hours,
+            weekends=weekends,
+            holidays=holidays,
+            open_hours=datetime.timedelta(microseconds=schedule.day_length),
+            _schedule=schedule,
+            _day_length=schedule.day_length,
+            _uniform=_isuniform(schedule, weekendmask, weekendpredicate),
+            _weekendmask=weekendmask,
+            _weekendpredicate=weekendpredicate,
+            _holidays=dates,
+            _index=index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError("%s is read-only" % type(self).__name__)
+
+
+class CompiledCalendar(ReadOnlyCalendar):
+    """
+    A read-only snapshot of a BusinessTime for the dates in
+    start <= x <= end, made with BusinessTime.freeze. Queries that need a
+    date outside that range raise ValueError.
+    """
+
+    __slots__ = ('start', 'end')
+
+    def __init__(self, businesstime, start, end):
+        if isinstance(start, datetime.datetime):
+            start = start.date()
+        if isinstance(end, datetime.datetime):
+            end = end.date()
+        index = BusinessDayIndex(businesstime, start, end)
+        holidays = FrozenDateSet(
+            businesstime._holidays.between(
+                start, end + datetime.timedelta(days=1)), start, end)
+        business_hours = businesstime.business_hours
+        if not isinstance(business_hours, Schedule):
+            business_hours = tuple(business_hours)
+        self._assign_calendar(business_hours, businesstime.weekends,
+                              tuple(holidays), businesstime._schedule,
+                              holidays, index)
+        self._assign(start=start, end=end)
+
+
+class SharedCalendar(ReadOnlyCalendar):
+    """
+    A read-only view of a BusinessTime, handed out by BusinessTime.shared.
+    It answers the same queries for any date, using the BusinessTime's
+    holiday cache, which is safe to use from several threads.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, businesstime):
+        self._assign_calendar(businesstime.business_hours,
+                              businesstime.weekends, businesstime.holidays,
+                              businesstime._schedule, businesstime._holidays,
+                              None)
+
+
+def _weekday_hours(calendar, weekday):
+    """
+    DayHours a calendar usually has on weekday: none when it is a weekend
+    """
+    if calendar._weekendpredicate is None and (
+            calendar._weekendmask >> weekday & 1):
+        return _CLOSED
+    return calendar._schedule.weekdays[weekday]
+
+
+_CLOSED = DayHours([])
+
+
+class CompositeCalendar(CompiledCalendar):
+    """
+    A read-only calendar for the times when all (how='all') or any
+    (how='any') of several calendars are open, compiled for the dates in
+    start <= x <= end. Every calendar's business hours must be given in the
+    same time zone. The calendars' hours on each date are combined once, up
+    front, into one Schedule of weekday hours and exceptions, weekends,
+    holidays and business day index, so queries cost what they do on a
+    CompiledCalendar. Queries that need a date outside the range raise
+    ValueError.
+    """
+
+    __slots__ = ('calendars', 'how')
+
+    def __init__(self, calendars, start, end, how='all'):
+        if isinstance(start, datetime.datetime):
+            start = start.date()
+        if isinstance(end, datetime.datetime):
+            end = end.date()
+        calendars = tuple(calendars)
+        if not calendars:
+            raise ValueError("a composite calendar needs calendars")
+        weekly = [combine_hours([_weekday_hours(calendar, weekday)
+                                 for calendar in calendars], how)
+                  for weekday in range(7)]
+        usual = [DayHours(pairs) for pairs in weekly]
+
+        exceptions = {}
+        closed = []
+        open_weekdays = set()
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            weekday = _weekday_of_ordinal(ordinal)
+            pairs = combine_hours([
+                calendar._schedule.day(ordinal)
+                if calendar._isbusinessordinal(ordinal) else _CLOSED
+                for calendar in calendars
+            ], how)
+            if not pairs:
+                closed.append(ordinal)
+                continue
+            open_weekdays.add(weekday)
+            hours = DayHours(pairs)
+            if (hours.opens, hours.closes) != (usual[weekday].opens,
+                                               usual[weekday].closes):
+                exceptions[datetime.date.fromordinal(ordinal)] = pairs
+
+        # Weekdays never open are weekends; the other closed days, holidays
+        weekends = tuple(weekday for weekday in range(7)
+                         if weekday not in open_weekdays and
+                         not usual[weekday].length)
+        weekendmask = _weekend_model(weekends)[0]
+        holidays = FrozenDateSet(
+            (datetime.date.fromordinal(ordinal) for ordinal in closed
+             if not weekendmask >> _weekday_of_ordinal(ordinal) & 1),
+            start, end)
+        schedule = Schedule(dict(enumerate(weekly)), exceptions)
+        if not schedule.day_length:
+            schedule.day_length = max(
+                [hours.length for hours in schedule.exceptions.values()] +
+                [0])
+        if not schedule.day_length:
+            raise ValueError("the calendars are never open %s" %
+                             ("at the same time" if how == 'all' else
+                              "in this range"))
+        self._assign_calendar(schedule, weekends, tuple(holidays), schedule,
+                              holidays, None)
+        self._assign(calendars=calendars, how=how, start=start, end=end)
+        # Built from the composite's own isbusinessday, so last
+        self._assign(_index=BusinessDayIndex(self, start, end))
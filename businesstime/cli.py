@@ -0,0 +1,267 @@
+"""
+Compute business time for a large CSV or JSON-lines file of start/end
+timestamps, e.g.
+
+    python -m businesstime tickets.csv --holidays us --output out.csv
+
+Rows are read lazily and sent in chunks to a pool of worker processes, each
+of which builds the calendar once. Results are written in input order with
+at most a fixed number of chunks in flight, so memory use does not depend
+on the size of the input.
+"""
+import argparse
+import collections
+import csv
+import datetime
+import importlib
+import json
+import multiprocessing
+import sys
+
+from businesstime import BusinessTime
+
+HOLIDAY_PROVIDERS = {
+    'none': None,
+    'us': 'businesstime.holidays.usa:USFederalHolidays',
+    'england': 'businesstime.holidays.uk:EnglandHolidays',
+    'wales': 'businesstime.holidays.uk:WalesHolidays',
+    'scotland': 'businesstime.holidays.uk:ScotlandHolidays',
+    'northern-ireland': 'businesstime.holidays.uk:NorthernIrelandHolidays',
+    'queensland': 'businesstime.holidays.aus:QueenslandPublicHolidays',
+    'brisbane': 'businesstime.holidays.aus:BrisbanePublicHolidays',
+}
+
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+)
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_datetime(value):
+    """
+    Naive datetime from an ISO 8601 string (without a UTC offset) or from a
+    POSIX timestamp, which is read as UTC
+    """
+    if isinstance(value, (int, float)):
+        return EPOCH + datetime.timedelta(seconds=value)
+    value = value.strip()
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    try:
+        return EPOCH + datetime.timedelta(seconds=float(value))
+    except ValueError:
+        raise ValueError("unrecognised timestamp: %r" % (value, ))
+
+
+def parse_time(value):
+    return datetime.datetime.strptime(value, '%H:%M').time()
+
+
+def load_holidays(name):
+    """
+    Holiday provider instance for one of HOLIDAY_PROVIDERS or a
+    'package.module:ClassName' path
+    """
+    path = HOLIDAY_PROVIDERS.get(name, name)
+    if path is None:
+        return None
+    module, _, attr = path.partition(':')
+    return getattr(importlib.import_module(module), attr)()
+
+
+def build_calendar(config):
+    """
+    BusinessTime for a plain dict of command line options, so the same
+    configuration can be sent to every worker process
+    """
+    bt = BusinessTime(
+        business_hours=(parse_time(config['open']),
+                        parse_time(config['close'])),
+        weekends=tuple(config['weekends']),
+        holidays=load_holidays(config['holidays']))
+    if config.get('index') is not None:
+        first, last = config['index']
+        bt.compile_index(datetime.date(first, 1, 1), datetime.date(last, 12, 31))
+    return bt
+
+
+_calendar = None
+
+
+def _init_worker(config):
+    global _calendar
+    _calendar = build_calendar(config)
+
+
+def _business_seconds(calendar, start, end):
+    microseconds = calendar._businessmicroseconds(parse_datetime(start),
+                                                  parse_datetime(end))
+    if microseconds % 1000000:
+        return microseconds / 1000000.0
+    return microseconds // 1000000
+
+
+def _process_chunk(pairs):
+    return [_business_seconds(_calendar, start, end) for start, end in pairs]
+
+
+def read_rows(infile, fmt):
+    if fmt == 'csv':
+        reader = csv.DictReader(infile)
+        return reader.fieldnames, reader
+    return None, (json.loads(line) for line in infile if line.strip())
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_results(config, chunks, field_names, workers, max_pending):
+    """
+    Yields (row, business seconds) for every row in chunks, in input order,
+    with at most max_pending chunks being worked on at any time
+    """
+    start_field, end_field = field_names
+
+    def pairs(chunk):
+        return [(row[start_field], row[end_field]) for row in chunk]
+
+    if workers <= 1:
+        _init_worker(config)
+        for chunk in chunks:
+            for row, result in zip(chunk, _process_chunk(pairs(chunk))):
+                yield row, result
+        return
+
+    pool = multiprocessing.Pool(workers, _init_worker, (config, ))
+    try:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.apply_async(_process_chunk,
+                                                    (pairs(chunk), ))))
+            if len(pending) >= max_pending:
+                chunk, result = pending.popleft()
+                for item in zip(chunk, result.get()):
+                    yield item
+        while pending:
+            chunk, result = pending.popleft()
+            for item in zip(chunk, result.get()):
+                yield item
+    finally:
+        pool.terminate()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m businesstime',
+        description='Business time between start/end timestamps in a CSV '
+        'or JSON-lines file')
+    parser.add_argument(
+        'input', help="CSV or JSON-lines file, or '-' for stdin")
+    parser.add_argument(
+        '-o', '--output', default='-', help="output file, '-' for stdout")
+    parser.add_argument(
+        '--format',
+        choices=('csv', 'jsonl'),
+        help='input and output format, guessed from the file name when '
+        'omitted')
+    parser.add_argument('--start-field', default='start')
+    parser.add_argument('--end-field', default='end')
+    parser.add_argument(
+        '--result-field',
+        default='business_seconds',
+        help='name of the added field holding business seconds')
+    parser.add_argument('--open', default='09:00', help='HH:MM')
+    parser.add_argument('--close', default='17:00', help='HH:MM')
+    parser.add_argument(
+        '--weekends',
+        default='5,6',
+        help='comma separated weekday numbers, Monday is 0')
+    parser.add_argument(
+        '--holidays',
+        default='none',
+        help='one of %s, or a package.module:ClassName path' %
+        ', '.join(sorted(HOLIDAY_PROVIDERS)))
+    parser.add_argument(
+        '--index',
+        metavar='FIRST_YEAR-LAST_YEAR',
+        help='compile a business day index for these years in each worker')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help='worker processes; 1 computes in this process')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        help='chunks in flight at once, twice the workers by default')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    fmt = args.format
+    if fmt is None:
+        fmt = 'jsonl' if args.input.endswith(('.jsonl', '.json',
+                                              '.ndjson')) else 'csv'
+    config = {
+        'open': args.open,
+        'close': args.close,
+        'weekends': [int(day) for day in args.weekends.split(',') if day],
+        'holidays': args.holidays,
+        'index': None,
+    }
+    if args.index:
+        first, _, last = args.index.partition('-')
+        config['index'] = (int(first), int(last or first))
+    # Fail here rather than in every worker
+    build_calendar(config)
+
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        fieldnames, rows = read_rows(infile, fmt)
+        if fmt == 'csv' and fieldnames is None:
+            # An empty file has no header, and so no rows, to write
+            return
+        results = iter_results(config, chunked(rows, args.chunk_size),
+                               (args.start_field, args.end_field),
+                               args.workers, args.max_pending or
+                               2 * max(args.workers, 1))
+        if fmt == 'csv':
+            writer = csv.DictWriter(
+                outfile, fieldnames=list(fieldnames) + [args.result_field])
+            writer.writeheader()
+            for row, result in results:
+                row[args.result_field] = result
+                writer.writerow(row)
+        else:
+            for row, result in results:
+                row[args.result_field] = result
+                outfile.write(json.dumps(row) + '\n')
+    except (KeyError, ValueError) as e:
+        parser.exit(1, '%s: error: %s\n' % (parser.prog, e))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
@@ -0,0 +1,69 @@
+"""
+A running business-time clock for a calendar. Reading the clock at a
+datetime gives the business time since a fixed anchor day, so the business
+time between any two readings is a subtraction. The clock remembers where
+the start of a few recently read days are, so readings that move forward
+through time only measure the days since the previous one.
+"""
+from businesstime.schedule import _time_to_microseconds
+
+
+class BusinessClock(object):
+    """
+    Business microseconds since the start of the anchor date for a
+    BusinessTime or CompiledCalendar. Each cursor caches the position of one
+    day; readings name the cursor to measure from, so independent streams of
+    readings (span starts and span ends, say) each move their own.
+    """
+
+    def __init__(self, businesstime, anchor, cursors=2):
+        self.businesstime = businesstime
+        if not isinstance(anchor, int):
+            anchor = anchor.toordinal()
+        self.anchor = anchor
+        # [ordinal, business microseconds from the anchor to its start,
+        #  (DayHours, is a business day) or None until first read]
+        self._cursors = [[anchor, 0, None] for i in range(cursors)]
+
+    def _move(self, ordinal, cursor):
+        position = self._cursors[cursor]
+        if ordinal != position[0]:
+            if ordinal > position[0]:
+                position[1] += self.businesstime._business_length(
+                    position[0], ordinal)
+            else:
+                position[1] -= self.businesstime._business_length(
+                    ordinal, position[0])
+            position[0] = ordinal
+            position[2] = None
+        return position
+
+    def day_position(self, ordinal, cursor=0):
+        """
+        Business microseconds from the start of the anchor date to the start
+        of the date with the given ordinal, moving cursor there
+        """
+        return self._move(ordinal, cursor)[1]
+
+    def read(self, ordinal, time, cursor=0):
+        """
+        (position, edge) at time microseconds into ordinal, where edge is
+        BaseBusinessTime._edge for that moment
+        """
+        position = self._move(ordinal, cursor)
+        if position[2] is None:
+            position[2] = (self.businesstime._schedule.day(ordinal),
+                           self.businesstime._isbusinessordinal(ordinal))
+        hours, isbusinessday = position[2]
+        if isbusinessday:
+            elapsed = hours.elapsed(time)
+            return position[1] + elapsed, (hours, elapsed)
+        return position[1], (hours, None)
+
+    def position(self, dt, cursor=0):
+        """
+        Business microseconds from the start of the anchor date to dt,
+        negative before it
+        """
+        return self.read(dt.toordinal(), _time_to_microseconds(dt.time()),
+                         cursor)[0]
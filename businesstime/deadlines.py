@@ -0,0 +1,90 @@
+"""
+Business deadlines for many items, each found once with add_businesstime
+and kept in a heap, so finding the items that have run out of business time
+as the current time moves on only looks at the ones that have.
+"""
+import heapq
+import itertools
+
+# Key of a heap entry whose item has been unscheduled
+_REMOVED = object()
+
+
+class DeadlineScheduler(object):
+    """
+    Items added under a hashable key with a start datetime and a budget of
+    business time, a timedelta in which each day is a full business day as
+    for add_businesstime. An item is breached once more business time than
+    its budget has passed since its start.
+    """
+
+    def __init__(self, businesstime):
+        self.businesstime = businesstime
+        # [breach, sequence, key, deadline], sequence keeping equal
+        # breaches in the order they were added and never comparing keys
+        self._heap = []
+        self._entries = {}
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key, start, budget):
+        """
+        Schedule key, replacing any item already scheduled under it, and
+        return its deadline: add_businesstime(start, budget)
+        """
+        self.discard(key)
+        deadline = self.businesstime.add_businesstime(start, budget)
+        # The business time since start only goes past the budget once
+        # business hours are open after the deadline, which is the next
+        # opening when the deadline is at a closing time
+        breach = self.businesstime.next_business_open(deadline)
+        entry = [breach, next(self._sequence), key, deadline]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        return deadline
+
+    def remove(self, key):
+        """
+        Unschedule key. Raises KeyError when it is not scheduled.
+        """
+        # Left in the heap, and skipped when it reaches the top
+        self._entries.pop(key)[2] = _REMOVED
+
+    def discard(self, key):
+        if key in self._entries:
+            self.remove(key)
+
+    def deadline(self, key):
+        return self._entries[key][3]
+
+    def _top(self):
+        while self._heap and self._heap[0][2] is _REMOVED:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def next_deadline(self):
+        """
+        (key, deadline) of the item due first, or None when there are none
+        """
+        entry = self._top()
+        if entry is None:
+            return None
+        return entry[2], entry[3]
+
+    def breaches(self, now):
+        """
+        Lazily yields (key, deadline) for each item breached at now, earliest
+        deadline first, unscheduling it as it is yielded
+        """
+        while True:
+            entry = self._top()
+            if entry is None or entry[0] >= now:
+                return
+            heapq.heappop(self._heap)
+            del self._entries[entry[2]]
+            yield entry[2], entry[3]
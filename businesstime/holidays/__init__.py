@@ -1,6 +1,24 @@
-import math
-import datetime
+import bisect
 import calendar
+import datetime
+import math
+
+
+# Values for a rule's "observed" key: day offsets, by weekday, to the day a
+# holiday falling on that weekday is also observed
+OBSERVED_NEAREST_WEEKDAY = {5: -1, 6: 1}  # Saturday to Friday, Sunday to Monday
+OBSERVED_MONDAY = {5: 2, 6: 1}  # Saturday and Sunday to Monday
+
+
+def _overrides(obj, name, base=None):
+    """
+    Whether type(obj) replaces base's (by default Holidays') implementation
+    of the method name
+    """
+    method = getattr(type(obj), name)
+    original = getattr(base or Holidays, name)
+    return getattr(method, '__func__', method) is not getattr(
+        original, '__func__', original)
 
 
 class Holidays(object):
@@ -25,15 +43,159 @@ class Holidays(object):
                 return True
         return False
 
-    def isholiday(self, dt):
+    def _rules_match(self, dt):
         for r in self.rules:
             if self._day_rule_matches(r, dt) or self._weekday_rule_matches(
                     r, dt):
                 return True
+            for weekday, offset in r.get("observed", {}).items():
+                actual = dt - datetime.timedelta(days=offset)
+                if actual.weekday() == weekday and (
+                        self._day_rule_matches(r, actual) or
+                        self._weekday_rule_matches(r, actual)):
+                    return True
         return False
 
+    def _rule_dates(self, rule, year):
+        """
+        The dates in year matched by rule, including the days its holidays
+        are observed on, equivalent to checking every day of the year with
+        _rules_match
+        """
+        observed = rule.get("observed")
+        if not observed:
+            return self._actual_rule_dates(rule, year)
+        dates = []
+        # Observance can move a holiday into the year from either side
+        for actual_year in (year - 1, year, year + 1):
+            for actual in self._actual_rule_dates(rule, actual_year):
+                if actual_year == year:
+                    dates.append(actual)
+                offset = observed.get(actual.weekday())
+                if offset:
+                    dt = actual + datetime.timedelta(days=offset)
+                    if dt.year == year:
+                        dates.append(dt)
+        return dates
+
+    def _actual_rule_dates(self, rule, year):
+        """
+        The dates in year matched by rule itself, equivalent to checking
+        every day of the year with _day_rule_matches and
+        _weekday_rule_matches
+        """
+        month = rule.get("month")
+        if month is None:
+            return []
+        dates = []
+        if rule.get("day") is not None:
+            try:
+                dates.append(datetime.date(year, month, rule["day"]))
+            except ValueError:
+                pass
+        if rule.get("weekday") is not None and rule.get("week"):
+            week = rule["week"]
+            first = 1 + (rule["weekday"] - datetime.date(
+                year, month, 1).weekday()) % 7
+            occurrences = range(first, self.month_length(year, month) + 1, 7)
+            if -len(occurrences) <= week <= len(occurrences):
+                day = occurrences[week - 1 if week > 0 else week]
+                dates.append(datetime.date(year, month, day))
+        return dates
+
+    def _compile_year(self, year):
+        """
+        Sorted list of the holidays in year
+        """
+        if _overrides(self, 'isholiday'):
+            matches = self.isholiday
+        elif _overrides(self, '_day_rule_matches') or _overrides(
+                self, '_weekday_rule_matches'):
+            matches = self._rules_match
+        else:
+            matches = None
+
+        if matches is None:
+            dates = set()
+            for rule in self.rules:
+                dates.update(self._rule_dates(rule, year))
+            return sorted(dates)
+
+        # The subclass has its own idea of what a holiday is, so ask it about
+        # every day of the year once and keep the answers. An isholiday
+        # that defers to Holidays.isholiday gets the rules' answer meanwhile,
+        # instead of asking for the table being compiled.
+        compiling = self.__dict__.setdefault('_compiling_years', set())
+        compiling.add(year)
+        try:
+            dt = datetime.date(year, 1, 1)
+            dates = []
+            while dt.year == year:
+                if matches(dt):
+                    dates.append(dt)
+                dt += datetime.timedelta(days=1)
+        finally:
+            compiling.discard(year)
+        return dates
+
+    def _holiday_table(self, year):
+        """
+        (sorted tuple, frozenset) of the holidays in year, compiled on first
+        use and cached
+        """
+        tables = self.__dict__.setdefault('_holiday_tables', {})
+        table = tables.get(year)
+        if table is None:
+            dates = self._compile_year(year)
+            table = tables[year] = (tuple(dates), frozenset(dates))
+        return table
+
+    def isholiday(self, dt):
+        if isinstance(dt, datetime.datetime):
+            dt = dt.date()
+        if dt.year in self.__dict__.get('_compiling_years', ()):
+            return self._rules_match(dt)
+        return dt in self._holiday_table(dt.year)[1]
+
+    def holidays_between(self, start, end):
+        """
+        Sorted list of the holidays in start <= x < end. Datetimes are
+        truncated to their date. Each year's table is bisected, so the time
+        taken depends on the number of years and holidays, not days.
+        """
+        if isinstance(start, datetime.datetime):
+            start = start.date()
+        if isinstance(end, datetime.datetime):
+            end = end.date()
+        dates = []
+        if end <= start:
+            return dates
+        last = end - datetime.timedelta(days=1)
+        for year in range(start.year, last.year + 1):
+            table = self._holiday_table(year)[0]
+            dates.extend(table[bisect.bisect_left(table, start):
+                               bisect.bisect_left(table, end)])
+        return dates
+
     def __call__(self, curr, end=None):
-        while end is None or curr < end:
-            if self.isholiday(curr):
-                yield curr
-            curr = curr + datetime.timedelta(days=1)
+        if end is not None and curr >= end:
+            return
+        with_time = isinstance(curr, datetime.datetime)
+        first = curr.date() if with_time else curr
+        year = curr.year
+        while True:
+            year_start = datetime.date(year, 1, 1)
+            if with_time:
+                year_start = datetime.datetime.combine(year_start,
+                                                       curr.timetz())
+            if end is not None and year_start >= end:
+                return
+            for dt in self._holiday_table(year)[0]:
+                if dt < first:
+                    continue
+                if with_time:
+                    dt = datetime.datetime.combine(dt, curr.timetz())
+                if end is not None and dt >= end:
+                    return
+                yield dt
+            year += 1
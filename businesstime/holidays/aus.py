@@ -1,5 +1,8 @@
-from datetime import date
-from businesstime.holidays import Holidays
+import array
+import bisect
+from datetime import date, datetime, timedelta
+
+from businesstime.holidays import Holidays, _overrides
 
 
 class QueenslandPublicHolidays(Holidays):
@@ -116,12 +119,62 @@ class QueenslandPublicHolidays(Holidays):
         date(2019, 12, 26),
     ]
 
-    def isholiday(self, dt):
-        if dt.year < self._coverage_start_year or dt.year > self._coverage_end_year:
+    @classmethod
+    def _holiday_index(cls):
+        """
+        (frozenset, sorted array of ordinals) of cls.holidays, built the first
+        time each class is used
+        """
+        index = cls.__dict__.get('_index')
+        if index is None:
+            index = (frozenset(cls.holidays),
+                     array.array('i', sorted(
+                         set(dt.toordinal() for dt in cls.holidays))))
+            cls._index = index
+        return index
+
+    def _check_coverage(self, year):
+        if year < self._coverage_start_year or year > self._coverage_end_year:
             raise NotImplementedError(
                 'QueenslandPublicHolidays only covers the years %s to %s' %
                 (self._coverage_start_year, self._coverage_end_year))
-        return any(holiday == dt for holiday in self.holidays)
+
+    def _compile_year(self, year):
+        self._check_coverage(year)
+        if _overrides(self, 'isholiday', QueenslandPublicHolidays):
+            # Ask the subclass's isholiday, as Holidays does
+            return super(QueenslandPublicHolidays, self)._compile_year(year)
+        ordinals = self._holiday_index()[1]
+        return [
+            date.fromordinal(ordinal) for ordinal in ordinals[
+                bisect.bisect_left(ordinals, date(year, 1, 1).toordinal()):
+                bisect.bisect_left(ordinals, date(year + 1, 1, 1).toordinal())]
+        ]
+
+    def isholiday(self, dt):
+        if isinstance(dt, datetime):
+            dt = dt.date()
+        self._check_coverage(dt.year)
+        return dt in self._holiday_index()[0]
+
+    def holidays_between(self, start, end):
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        if end <= start:
+            return []
+        self._check_coverage(start.year)
+        self._check_coverage((end - timedelta(days=1)).year)
+        if _overrides(self, 'isholiday', QueenslandPublicHolidays):
+            return super(QueenslandPublicHolidays, self).holidays_between(
+                start, end)
+        ordinals = self._holiday_index()[1]
+        return [
+            date.fromordinal(ordinal) for ordinal in ordinals[
+                bisect.bisect_left(ordinals, start.toordinal()):
+                bisect.bisect_left(ordinals, end.toordinal())]
+        ]
 
 
 class BrisbanePublicHolidays(QueenslandPublicHolidays):
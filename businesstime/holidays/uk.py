@@ -1,8 +1,13 @@
+import array
+import bisect
 import datetime
 import json
 import os
+import struct
+import sys
+import threading
 
-from businesstime.holidays import Holidays
+from businesstime.holidays import Holidays, _overrides
 
 
 __all__ = (
@@ -14,6 +19,111 @@ __all__ = (
 PWD = os.path.dirname(os.path.realpath(__file__))
 DEFAULT_HOLIDAYS_FILEPATH = os.path.join(PWD, 'data', 'uk-bank-holidays.json')
 
+DIVISIONS = ('england-and-wales', 'scotland', 'northern-ireland', )
+
+# A snapshot is this magic, then for each of DIVISIONS a little-endian int32
+# count followed by that many int32 date ordinals in ascending order
+SNAPSHOT_MAGIC = b'BTUKBH\x00\x01'
+
+_divisions_by_path = {}
+_divisions_lock = threading.Lock()
+
+
+class DivisionHolidays(object):
+    """
+    One division's bank holidays as a sorted tuple of dates, a frozenset of
+    the same dates and an array of their ordinals. Instances are shared by
+    every UKHolidays for the same data file, so treat them as read-only.
+    """
+
+    __slots__ = ('dates', 'dateset', 'ordinals')
+
+    def __init__(self, ordinals):
+        self.ordinals = array.array('i', sorted(set(ordinals)))
+        self.dates = tuple(
+            datetime.date.fromordinal(ordinal) for ordinal in self.ordinals)
+        self.dateset = frozenset(self.dates)
+
+    def between(self, start, end):
+        """
+        Sorted list of the holidays in start <= x < end
+        """
+        return list(self.dates[bisect.bisect_left(self.ordinals, start.toordinal(
+        )):bisect.bisect_left(self.ordinals, end.toordinal())])
+
+
+def _parse_date(value):
+    # Much cheaper than strptime for the fixed YYYY-MM-DD format
+    return datetime.date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+
+
+def _parse_json(data):
+    divisions = json.loads(data.decode('utf-8'))
+    return dict((division, DivisionHolidays(
+        _parse_date(event['date']).toordinal()
+        for event in divisions[division]['events']))
+                for division in DIVISIONS if division in divisions)
+
+
+def _int32s(data):
+    ordinals = array.array('i')
+    getattr(ordinals, 'frombytes', getattr(ordinals, 'fromstring', None))(data)
+    if sys.byteorder != 'little':
+        ordinals.byteswap()
+    return ordinals
+
+
+def _parse_snapshot(data):
+    divisions = {}
+    offset = len(SNAPSHOT_MAGIC)
+    for division in DIVISIONS:
+        count, = struct.unpack_from('<i', data, offset)
+        offset += 4
+        divisions[division] = DivisionHolidays(
+            _int32s(data[offset:offset + 4 * count]))
+        offset += 4 * count
+    return divisions
+
+
+def load_divisions(filepath=DEFAULT_HOLIDAYS_FILEPATH):
+    """
+    Dict of division name to DivisionHolidays for a gov.uk JSON file or a
+    snapshot written by write_snapshot. Each file is read and parsed once
+    per process.
+    """
+    filepath = os.path.realpath(filepath)
+    divisions = _divisions_by_path.get(filepath)
+    if divisions is None:
+        with _divisions_lock:
+            divisions = _divisions_by_path.get(filepath)
+            if divisions is None:
+                with open(filepath, 'rb') as f:
+                    data = f.read()
+                if data.startswith(SNAPSHOT_MAGIC):
+                    divisions = _parse_snapshot(data)
+                else:
+                    divisions = _parse_json(data)
+                _divisions_by_path[filepath] = divisions
+    return divisions
+
+
+def write_snapshot(path, filepath=DEFAULT_HOLIDAYS_FILEPATH):
+    """
+    Write the holidays in filepath to path as a binary snapshot, which can
+    be passed as holidays_filepath and loads without any JSON or date
+    parsing
+    """
+    divisions = load_divisions(filepath)
+    with open(path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        for division in DIVISIONS:
+            ordinals = array.array('i', divisions[division].ordinals)
+            if sys.byteorder != 'little':
+                ordinals.byteswap()
+            f.write(struct.pack('<i', len(ordinals)))
+            f.write(getattr(ordinals, 'tobytes', getattr(ordinals, 'tostring',
+                                                         None))())
+
 
 class UKHolidays(Holidays):
     """
@@ -21,7 +131,7 @@ class UKHolidays(Holidays):
 
     e.g. curl https://www.gov.uk/bank-holidays.json -o uk-bank-holidays.json
     """
-    DIVISION_CHOICES = ('england-and-wales', 'scotland', 'northern-ireland', )
+    DIVISION_CHOICES = DIVISIONS
     division = None
 
     def __init__(self, *args, **kwargs):
@@ -30,30 +140,50 @@ class UKHolidays(Holidays):
                 "'division' class attribute must be one of {}. You picked: {}"
                 .format(self.DIVISION_CHOICES, self.division)
             )
-        self.holidays = kwargs.pop('holidays', None)
+        holidays = kwargs.pop('holidays', None)
         holidays_filepath = kwargs.pop('holidays_filepath',
                                        DEFAULT_HOLIDAYS_FILEPATH)
-        if self.holidays is None:
-            self.holidays = self._get_holidays_from_filepath(holidays_filepath)
+        if holidays is None:
+            self._division_holidays = load_divisions(
+                holidays_filepath)[self.division]
+        else:
+            self._division_holidays = DivisionHolidays(
+                dt.toordinal() for dt in holidays)
+        self.holidays = self._division_holidays.dates
         super(UKHolidays, self).__init__(*args, **kwargs)
 
     @classmethod
     def _get_holidays_from_filepath(cls, filepath):
-        with open(filepath) as f:
-            return cls._parse_holidays_file(f)
+        return list(load_divisions(filepath)[cls.division].dates)
 
     @classmethod
     def _parse_holidays_file(cls, holidays_file):
         _holidays = json.load(holidays_file)
         return [
-            datetime.datetime.strptime(event['date'], "%Y-%m-%d").date()
+            _parse_date(event['date'])
             for event in _holidays[cls.division]['events']
         ]
 
+    def _compile_year(self, year):
+        if _overrides(self, 'isholiday', UKHolidays):
+            # Ask the subclass's isholiday, as Holidays does
+            return super(UKHolidays, self)._compile_year(year)
+        return self._division_holidays.between(
+            datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1))
+
     def isholiday(self, dt):
         if isinstance(dt, datetime.datetime):
-            return dt.date() in self.holidays
-        return dt in self.holidays
+            dt = dt.date()
+        return dt in self._division_holidays.dateset
+
+    def holidays_between(self, start, end):
+        if _overrides(self, 'isholiday', UKHolidays):
+            return super(UKHolidays, self).holidays_between(start, end)
+        if isinstance(start, datetime.datetime):
+            start = start.date()
+        if isinstance(end, datetime.datetime):
+            end = end.date()
+        return self._division_holidays.between(start, end)
 
 
 class EnglandHolidays(UKHolidays):
@@ -0,0 +1,121 @@
+import binascii
+import bisect
+import datetime
+from array import array
+
+# Days per rank directory entry; a multiple of 8 so blocks start on a byte
+BLOCK_DAYS = 256
+BLOCK_BYTES = BLOCK_DAYS // 8
+
+# Set bits in every byte value
+_POPCOUNT = bytearray(bin(byte).count('1') for byte in range(256))
+
+
+def _ordinal(dt):
+    if isinstance(dt, int):
+        return dt
+    return dt.toordinal()
+
+
+def _popcount(data):
+    """
+    Number of set bits in a bytes-like object, counted in C
+    """
+    if not data:
+        return 0
+    return bin(int(binascii.hexlify(data), 16)).count('1')
+
+
+class BusinessDayIndex(object):
+    """
+    A bitmap with one bit per date ordinal in start <= x <= end, set for
+    business days, and a directory of the number of business days before
+    every block of BLOCK_DAYS days. Counting the business days in a span
+    inside that range, finding the n-th business day and testing a date are
+    a lookup plus a popcount of at most one block; a century of days takes
+    about 5 KB.
+    """
+
+    def __init__(self, businesstime, start, end):
+        self.start = _ordinal(start)
+        self.end = _ordinal(end)
+        if self.end < self.start:
+            raise ValueError("index end must not be before its start")
+        days = self.end - self.start + 1
+        bits = bytearray((days + 7) // 8)
+        for offset in range(days):
+            if businesstime.isbusinessday(
+                    datetime.date.fromordinal(self.start + offset)):
+                bits[offset >> 3] |= 1 << (offset & 7)
+        self._bits = bits
+        # _blocks[k] is the number of business days before block k
+        blocks = array('i', [0])
+        for first in range(0, len(bits), BLOCK_BYTES):
+            blocks.append(blocks[-1] +
+                          _popcount(bits[first:first + BLOCK_BYTES]))
+        self._blocks = blocks
+
+    @property
+    def nbytes(self):
+        return len(self._bits) + len(self._blocks) * self._blocks.itemsize
+
+    def covers(self, first, last):
+        """
+        Whether every date ordinal in first <= x < last is in the index
+        """
+        return self.start <= first and last <= self.end + 1
+
+    def _rank(self, offset):
+        """
+        Number of business days in the first offset days of the index
+        """
+        block, rest = divmod(offset, BLOCK_DAYS)
+        byte = block * BLOCK_BYTES + (rest >> 3)
+        count = self._blocks[block] + _popcount(
+            self._bits[block * BLOCK_BYTES:byte])
+        if rest & 7:
+            count += _POPCOUNT[self._bits[byte] & ((1 << (rest & 7)) - 1)]
+        return count
+
+    def _select(self, rank):
+        """
+        Offset of the rank-th business day in the index (1-based)
+        """
+        block = bisect.bisect_left(self._blocks, rank) - 1
+        rank -= self._blocks[block]
+        byte = block * BLOCK_BYTES
+        while _POPCOUNT[self._bits[byte]] < rank:
+            rank -= _POPCOUNT[self._bits[byte]]
+            byte += 1
+        bits = self._bits[byte]
+        for bit in range(8):
+            if bits >> bit & 1:
+                rank -= 1
+                if rank == 0:
+                    return byte * 8 + bit
+
+    def count(self, first, last):
+        """
+        Number of business days in first <= x < last, both given as ordinals
+        """
+        return self._rank(last - self.start) - self._rank(first - self.start)
+
+    def isbusinessday(self, ordinal):
+        offset = ordinal - self.start
+        return self._bits[offset >> 3] >> (offset & 7) & 1 == 1
+
+    def nth(self, ordinal, n, direction=1):
+        """
+        Ordinal of the n-th business day counting from ordinal (inclusive),
+        forwards when direction is 1 and backwards when it is -1, or None
+        when that day is not in the index
+        """
+        if not self.start <= ordinal <= self.end:
+            return None
+        if direction > 0:
+            rank = self._rank(ordinal - self.start) + n
+        else:
+            rank = self._rank(ordinal + 1 - self.start) - n + 1
+        if not 1 <= rank <= self._blocks[-1]:
+            return None
+        return self.start + self._select(rank)
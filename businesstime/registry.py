@@ -0,0 +1,84 @@
+"""
+A process-wide, size-bounded registry of calendars, so code that keeps
+asking for a calendar configured the same way gets one shared instance, with
+one holiday cache, instead of building and warming a new one every time.
+"""
+import collections
+import threading
+
+from businesstime.holidays import Holidays
+
+# Attributes Holidays uses for its own bookkeeping, which don't make two
+# providers different
+_PROVIDER_CACHES = ('_holiday_tables', '_compiling_years')
+
+
+def _provider_key(holidays):
+    """
+    Hashable stand-in for a holidays argument. Holiday providers of the
+    same class and with equal attributes are interchangeable; other
+    callables are only equal to themselves; a collection of dates is keyed
+    by its contents.
+    """
+    if holidays is None:
+        return None
+    if isinstance(holidays, Holidays):
+        state = tuple(
+            sorted((name, value) for name, value in vars(holidays).items()
+                   if name not in _PROVIDER_CACHES))
+        try:
+            hash(state)
+        except TypeError:
+            return holidays
+        return type(holidays), state
+    if callable(holidays):
+        return holidays
+    return frozenset(holidays)
+
+
+def calendar_key(cls, business_hours, weekends, holidays, *args):
+    """
+    Registry key for cls(business_hours, weekends, holidays, *args)
+    """
+    if isinstance(business_hours, list):
+        business_hours = tuple(business_hours)
+    if not callable(weekends):
+        weekends = frozenset(weekends)
+    return (cls, business_hours, weekends, _provider_key(holidays)) + args
+
+
+class CalendarRegistry(object):
+    """
+    Calendars by key, keeping the maxsize most recently used
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._calendars = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        """
+        The calendar registered under key, made with factory() and
+        registered first if there is none
+        """
+        with self._lock:
+            calendar = self._calendars.pop(key, None)
+            if calendar is None:
+                calendar = factory()
+            self._calendars[key] = calendar
+            while self.maxsize is not None and len(
+                    self._calendars) > self.maxsize:
+                self._calendars.popitem(last=False)
+            return calendar
+
+    def invalidate(self, key):
+        with self._lock:
+            self._calendars.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._calendars.clear()
+
+    def __len__(self):
+        return len(self._calendars)
@@ -0,0 +1,197 @@
+import bisect
+import datetime
+
+
+def _time_to_microseconds(t):
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 + t.microsecond
+
+
+def _microseconds_to_time(microseconds):
+    seconds, microsecond = divmod(microseconds, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return datetime.time(hour, minute, second, microsecond)
+
+
+def _intervals(spec):
+    """
+    Normalise None, one (open, close) pair or a list of pairs to a list of
+    pairs
+    """
+    if spec is None:
+        return []
+    spec = list(spec)
+    if len(spec) == 2 and isinstance(spec[0], datetime.time):
+        return [tuple(spec)]
+    return [tuple(pair) for pair in spec]
+
+
+class DayHours(object):
+    """
+    One day's business hours compiled to sorted, non-overlapping intervals in
+    microseconds since midnight, with the business time before each interval
+    precomputed so the business time elapsed by any time of day is a bisect
+    and a subtraction.
+    """
+
+    __slots__ = ('opens', 'closes', 'before', 'length', 'opening', 'closing')
+
+    def __init__(self, intervals):
+        merged = []
+        for start, end in sorted((_time_to_microseconds(start),
+                                  _time_to_microseconds(end))
+                                 for start, end in intervals):
+            if end <= start:
+                raise ValueError("business hours must close after they open")
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.opens = [start for start, end in merged]
+        self.closes = [end for start, end in merged]
+        self.before = []
+        total = 0
+        for start, end in merged:
+            self.before.append(total)
+            total += end - start
+        self.length = total
+        # An all-day-closed day opens and closes at midnight
+        self.opening = self.opens[0] if merged else 0
+        self.closing = self.closes[-1] if merged else 0
+
+    def elapsed(self, time):
+        """
+        Business microseconds from midnight up to time, in microseconds
+        """
+        i = bisect.bisect_right(self.opens, time) - 1
+        if i < 0:
+            return 0
+        return self.before[i] + min(time, self.closes[i]) - self.opens[i]
+
+    def isopen(self, time):
+        i = bisect.bisect_right(self.opens, time) - 1
+        return i >= 0 and time < self.closes[i]
+
+    def next_open(self, time):
+        """
+        The earliest time of day at or after time when open, or None
+        """
+        i = bisect.bisect_right(self.closes, time)
+        if i == len(self.opens):
+            return None
+        return max(time, self.opens[i])
+
+    def previous_close(self, time):
+        """
+        The latest time of day at or before time that is open or a closing
+        time, or None
+        """
+        i = bisect.bisect_left(self.opens, time)
+        if i == 0:
+            return None
+        return min(time, self.closes[i - 1])
+
+    def time_at(self, elapsed, latest=False):
+        """
+        The earliest time of day (or the latest, when latest is True) by which
+        elapsed microseconds of business time have passed, for
+        0 <= elapsed <= length
+        """
+        if latest:
+            i = bisect.bisect_right(self.before, elapsed) - 1
+        else:
+            i = max(bisect.bisect_left(self.before, elapsed) - 1, 0)
+        return self.opens[i] + elapsed - self.before[i]
+
+
+class Schedule(object):
+    """
+    Business hours that can differ by weekday, be split into several
+    intervals (for a lunch break, say) and be overridden on given dates
+    (half days, such as Christmas Eve).
+
+    hours is one (open, close) pair of datetime.time objects or a list of
+    such pairs, applying to every weekday, or a dict mapping weekday numbers
+    (Monday is 0) to either. Weekdays missing from the dict have no hours.
+    exceptions maps dates to the hours on that date, None meaning closed all
+    day.
+
+    day_length is the business time that counts as one day in
+    businesstimedelta's result; it defaults to the longest weekday.
+    """
+
+    def __init__(self, hours, exceptions=None, day_length=None):
+        if isinstance(hours, dict):
+            weekly = [hours.get(weekday) for weekday in range(7)]
+        else:
+            weekly = [hours] * 7
+        self.weekdays = tuple(DayHours(_intervals(spec)) for spec in weekly)
+        self.exceptions = dict(
+            (dt.toordinal(), DayHours(_intervals(spec)))
+            for dt, spec in (exceptions or {}).items())
+        self._exception_ordinals = sorted(self.exceptions)
+        if day_length is None:
+            self.day_length = max(day.length for day in self.weekdays)
+        else:
+            self.day_length = (day_length.days * 86400 + day_length.seconds
+                               ) * 1000000 + day_length.microseconds
+
+    @classmethod
+    def from_business_hours(cls, business_hours):
+        """
+        Schedule for BusinessTime's business_hours argument, which is either
+        a Schedule already or an (open, close) pair
+        """
+        if isinstance(business_hours, cls):
+            return business_hours
+        return cls(business_hours)
+
+    def day(self, ordinal):
+        """
+        DayHours for the date with the given ordinal
+        """
+        hours = self.exceptions.get(ordinal)
+        if hours is None:
+            hours = self.weekdays[(ordinal - 1) % 7]
+        return hours
+
+    def exceptions_between(self, first, last):
+        """
+        Ordinals of the dates with exceptional hours in first <= x < last
+        """
+        return self._exception_ordinals[bisect.bisect_left(
+            self._exception_ordinals, first):bisect.bisect_left(
+                self._exception_ordinals, last)]
+
+
+def combine_hours(days, how='all'):
+    """
+    (open, close) pairs of datetime.time for the times of day when all
+    (how='all') or any (how='any') of the DayHours in days are open
+    """
+    if how == 'any':
+        pairs = sorted(pair for hours in days
+                       for pair in zip(hours.opens, hours.closes))
+    elif how == 'all':
+        pairs = None
+        for hours in days:
+            other = list(zip(hours.opens, hours.closes))
+            if pairs is None:
+                pairs = other
+                continue
+            # Walk both sorted interval lists, keeping their overlaps
+            overlaps, i, j = [], 0, 0
+            while i < len(pairs) and j < len(other):
+                start = max(pairs[i][0], other[j][0])
+                end = min(pairs[i][1], other[j][1])
+                if start < end:
+                    overlaps.append((start, end))
+                if pairs[i][1] < other[j][1]:
+                    i += 1
+                else:
+                    j += 1
+            pairs = overlaps
+    else:
+        raise ValueError("how must be 'all' or 'any', not %r" % (how, ))
+    return [(_microseconds_to_time(start), _microseconds_to_time(end))
+            for start, end in pairs or ()]
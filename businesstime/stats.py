@@ -0,0 +1,107 @@
+"""
+Optional call counters and timings for BusinessTime, switched on with
+BusinessTime.enable_stats. Instrumentation works by shadowing the query
+methods on the instance, so a calendar with stats disabled runs exactly the
+same code as one that never had them.
+"""
+import collections
+import time
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+INSTRUMENTED = (
+    'isweekend',
+    'isholiday',
+    'isbusinessday',
+    'holidays_between',
+    'isduringbusinesshours',
+    'next_business_day',
+    'next_business_open',
+    'previous_business_close',
+    'iterdays',
+    'iterweekdays',
+    'iterbusinessdays',
+    'businesstimedelta',
+    'businesstime_hours',
+    'businessseconds',
+    'businessseconds_from_timestamps',
+    'add_businesstime',
+    'businesstimedelta_many',
+    'businesstime_hours_many',
+    'add_businesstime_many',
+)
+
+ITERATORS = ('iterdays', 'iterweekdays', 'iterbusinessdays')
+
+SPANS = ('businesstimedelta', 'businesstime_hours', 'businessseconds')
+
+
+class Stats(object):
+    """
+    Counters for one BusinessTime. Calls made by one query method to another
+    are counted too, and times are inclusive of them.
+    """
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.calls = collections.Counter()
+        self.seconds = collections.defaultdict(float)
+        self.days_yielded = collections.Counter()
+        self.span_days = 0
+
+    def record(self, name, elapsed, args):
+        self.calls[name] += 1
+        self.seconds[name] += elapsed
+        if name in SPANS:
+            self.span_days += abs((args[1] - args[0]).days)
+        if self.hook is not None:
+            self.hook(name, elapsed, args)
+
+    def as_dict(self):
+        return {
+            'calls': dict(self.calls),
+            'seconds': dict(self.seconds),
+            'days_yielded': dict(self.days_yielded),
+            'span_days': self.span_days,
+        }
+
+
+def _wrap(stats, name, method):
+    def instrumented(*args, **kwargs):
+        start = _timer()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats.record(name, _timer() - start, args)
+
+    return instrumented
+
+
+def _wrap_iterator(stats, name, method):
+    def instrumented(*args, **kwargs):
+        stats.record(name, 0.0, args)
+        iterator = method(*args, **kwargs)
+        while True:
+            start = _timer()
+            try:
+                dt = next(iterator)
+            except StopIteration:
+                stats.seconds[name] += _timer() - start
+                return
+            stats.seconds[name] += _timer() - start
+            stats.days_yielded[name] += 1
+            yield dt
+
+    return instrumented
+
+
+def instrument(businesstime, stats):
+    for name in INSTRUMENTED:
+        method = getattr(type(businesstime), name).__get__(businesstime)
+        wrap = _wrap_iterator if name in ITERATORS else _wrap
+        setattr(businesstime, name, wrap(stats, name, method))
+
+
+def uninstrument(businesstime):
+    for name in INSTRUMENTED:
+        businesstime.__dict__.pop(name, None)
@@ -0,0 +1,169 @@
+import bisect
+import collections
+import datetime
+import itertools
+import threading
+
+from businesstime.holidays import Holidays, _overrides
+
+CacheInfo = collections.namedtuple('CacheInfo',
+                                   ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _as_date(dt):
+    if isinstance(dt, datetime.datetime):
+        return dt.date()
+    return dt
+
+
+class SortedDateSet(object):
+    """
+    A collection of dates kept both as a set, for constant time membership
+    checks, and as a sorted list, for range queries. Datetimes are stored
+    as their date.
+    """
+
+    def __init__(self, dates=()):
+        self._set = set()
+        self._sorted = []
+        self.update(dates)
+
+    def add(self, dt):
+        dt = _as_date(dt)
+        if dt in self._set:
+            return
+        self._set.add(dt)
+        if not self._sorted or dt > self._sorted[-1]:
+            self._sorted.append(dt)
+        else:
+            bisect.insort(self._sorted, dt)
+
+    def update(self, dates):
+        new = set(_as_date(dt) for dt in dates) - self._set
+        if not new:
+            return
+        self._set.update(new)
+        new = sorted(new)
+        if self._sorted and new[0] < self._sorted[-1]:
+            self._sorted = sorted(self._set)
+        else:
+            self._sorted.extend(new)
+
+    def between(self, start, end):
+        """
+        Sorted list of dates in start <= x < end
+        """
+        return self._sorted[bisect.bisect_left(self._sorted, start):
+                            bisect.bisect_left(self._sorted, end)]
+
+    def __contains__(self, dt):
+        return dt in self._set
+
+    def __getitem__(self, index):
+        return self._sorted[index]
+
+    def __iter__(self):
+        return iter(self._sorted)
+
+    def __len__(self):
+        return len(self._sorted)
+
+
+class FrozenDateSet(SortedDateSet):
+    """
+    A SortedDateSet that is complete for first <= x <= last and refuses
+    questions about any other date rather than guessing.
+    """
+
+    def __init__(self, dates, first, last):
+        super(FrozenDateSet, self).__init__(dates)
+        self.first = first
+        self.last = last
+
+    def _check(self, dt):
+        if not self.first <= dt <= self.last:
+            raise ValueError("%s is outside the compiled range %s to %s" %
+                             (dt, self.first, self.last))
+
+    def between(self, start, end):
+        if end > start:
+            self._check(start)
+            self._check(end - datetime.timedelta(days=1))
+        return super(FrozenDateSet, self).between(start, end)
+
+    def __contains__(self, dt):
+        self._check(dt)
+        return super(FrozenDateSet, self).__contains__(dt)
+
+
+class HolidayYearCache(object):
+    """
+    Holidays from a callable holiday provider, fetched one calendar year at a
+    time so lookups can move backwards and forwards in time freely. At most
+    maxsize years are kept, evicting the least recently used; None means no
+    limit.
+    """
+
+    def __init__(self, provider, maxsize=128):
+        self.provider = provider
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._years = collections.OrderedDict()
+        # Calendars shared between threads look years up concurrently
+        self._lock = threading.Lock()
+
+    def _fetch(self, year):
+        start = datetime.date(year, 1, 1)
+        end = datetime.date(year + 1, 1, 1)
+        # holidays_between is Holidays' own view of what __call__ yields,
+        # so it only stands in for a __call__ that isn't overridden
+        if isinstance(self.provider, Holidays) and not _overrides(
+                self.provider, '__call__'):
+            dates = self.provider.holidays_between(start, end)
+        else:
+            dates = itertools.takewhile(lambda dt: dt < end,
+                                        self.provider(start))
+        return SortedDateSet(dates)
+
+    def year(self, year):
+        """
+        SortedDateSet of the holidays in year
+        """
+        with self._lock:
+            dates = self._years.pop(year, None)
+            if dates is not None:
+                self.hits += 1
+                self._years[year] = dates
+                return dates
+            self.misses += 1
+            dates = self._years[year] = self._fetch(year)
+            if self.maxsize is not None and len(self._years) > self.maxsize:
+                self._years.popitem(last=False)
+                self.evictions += 1
+            return dates
+
+    def between(self, start, end):
+        """
+        Sorted list of holidays in start <= x < end
+        """
+        dates = []
+        if end <= start:
+            return dates
+        last = end - datetime.timedelta(days=1)
+        for year in range(start.year, last.year + 1):
+            dates.extend(self.year(year).between(start, end))
+        return dates
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._years))
+
+    def clear(self):
+        with self._lock:
+            self._years.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __contains__(self, dt):
+        return dt in self.year(dt.year)
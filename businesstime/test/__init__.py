@@ -1,8 +1,22 @@
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta, tzinfo
+import threading
 import unittest
 
-from businesstime import BusinessTime
+import businesstime
+from businesstime import BusinessTime, CompositeCalendar
+from businesstime.clock import BusinessClock
+from businesstime.deadlines import DeadlineScheduler
 from businesstime.holidays.usa import USFederalHolidays
+from businesstime.schedule import Schedule
+from businesstime.tracker import SLATracker
+
+
+class FixedOffset(tzinfo):
+    def utcoffset(self, dt):
+        return timedelta(hours=-5)
+
+    def dst(self, dt):
+        return timedelta(0)
 
 
 class BusinessTimeTest(unittest.TestCase):
@@ -79,10 +93,40 @@ class BusinessTimeTest(unittest.TestCase):
         self.assertTrue(bd.isholiday(date(2014, 1, 1)))
         self.assertFalse(bd.isholiday(date(2014, 1, 2)))
 
+    def test_holidays_specified_as_unsorted_list(self):
+        bd = BusinessTime(holidays=[date(2014, 1, 20), date(2014, 1, 1)])
+        self.assertTrue(bd.isholiday(date(2014, 1, 1)))
+        self.assertTrue(bd.isholiday(datetime(2014, 1, 20, 12)))
+        self.assertFalse(bd.isholiday(date(2014, 1, 2)))
+        self.assertEqual(
+            bd._holidays.between(date(2014, 1, 1), date(2014, 1, 20)),
+            [date(2014, 1, 1)])
+
     def test_no_holidays(self):
         bt = BusinessTime()
         self.assertFalse(bt.isholiday(date(2014, 1, 1)))
 
+    def test_weekends_specified_as_callable(self):
+        # Every other Saturday is a working day
+        bt = BusinessTime(weekends=lambda dt: dt.weekday() == 6 or (
+            dt.weekday() == 5 and dt.isocalendar()[1] % 2 == 0))
+        self.assertTrue(bt.isweekend(date(2014, 1, 11)))
+        self.assertFalse(bt.isweekend(date(2014, 1, 18)))
+        self.assertEqual(
+            bt.businesstimedelta(
+                datetime(2014, 1, 10, 9), datetime(2014, 1, 20, 9)),
+            timedelta(days=7))
+
+    def test_businesstimedelta_long_span_fri_sat_weekends(self):
+        bt = BusinessTime(weekends=(4, 5))
+        start = datetime(2014, 1, 16, 12)
+        end = datetime(2024, 1, 16, 12)
+        weekdays = sum(1 for dt in bt.iterdays(start, end)
+                       if dt.weekday() not in (4, 5))
+        self.assertEqual(bt.businesstimedelta(start, end), timedelta(weekdays))
+        self.assertEqual(
+            bt._count_weekdays(start.toordinal(), end.toordinal()), weekdays)
+
     def test_businesstimedelta_after_during(self):
         start = datetime(2014, 1, 16, 18, 30)
         end = datetime(2014, 1, 22, 10, 0)
@@ -221,6 +265,24 @@ class BusinessTimeTest(unittest.TestCase):
         self.assertEqual(
             self.bt.businesstime_hours(start, end), timedelta(hours=-8))
 
+    def test_businesstime_hours_partial_day_reverse(self):
+        start = datetime(2014, 1, 16, 11, 0)
+        end = datetime(2014, 1, 16, 9, 0)
+        self.assertEqual(
+            self.bt.businesstime_hours(start, end), timedelta(hours=-2))
+
+    def test_businessseconds(self):
+        start = datetime(2014, 1, 16, 9, 0)
+        end = datetime(2014, 1, 17, 15, 0, 0, 999999)
+        self.assertEqual(self.bt.businessseconds(start, end), 14 * 3600)
+        self.assertEqual(self.bt.businessseconds(end, start), -14 * 3600)
+        self.assertEqual(
+            self.bt.businessseconds_from_timestamps(1389862800, 1389970800),
+            14 * 3600)
+        self.assertEqual(
+            self.bt.businessseconds_from_timestamps(1389970800.5, 1389862800),
+            -14 * 3600)
+
     def test_businesstime_out_of_hours_start(self):
         """
         Test for https://github.com/seatgeek/businesstime/issues/13
@@ -294,3 +356,537 @@ class BusinessTimeTest(unittest.TestCase):
         self.assertFalse(bt_cal.isholiday(non_holiday3))
         self.assertTrue(bt_cal.isholiday(christmas))
 
+    def test_holiday_cache_moves_both_ways(self):
+        bt = BusinessTime(holidays=USFederalHolidays(), holiday_cache_size=2)
+        self.assertTrue(bt.isholiday(date(2018, 5, 28)))
+        self.assertTrue(bt.isholiday(date(2017, 5, 29)))
+        self.assertTrue(bt.isholiday(date(2018, 1, 1)))
+        self.assertEqual(bt.holiday_cache_info(), (1, 2, 2, 2))
+        self.assertTrue(bt.isholiday(date(2016, 5, 30)))
+        self.assertTrue(bt.isholiday(date(2018, 12, 25)))
+        self.assertTrue(bt.isholiday(date(2017, 12, 25)))
+        self.assertEqual(bt.holiday_cache_info(), (2, 4, 2, 2))
+        self.assertIsNone(BusinessTime().holiday_cache_info())
+
+    def test_holidays_with_own_call(self):
+        class CallHolidays(USFederalHolidays):
+            def __call__(self, curr, end=None):
+                for dt in super(CallHolidays, self).__call__(curr, end):
+                    if dt > date(2014, 3, 3) >= curr:
+                        yield date(2014, 3, 3)
+                        curr = date(2014, 3, 4)
+                    yield dt
+
+        bt = BusinessTime(holidays=CallHolidays())
+        self.assertTrue(bt.isholiday(date(2014, 3, 3)))
+        self.assertTrue(bt.isholiday(date(2014, 5, 26)))
+
+    def test_compiled_index_matches_uncompiled(self):
+        indexed = BusinessTime(holidays=USFederalHolidays())
+        indexed.compile_index(date(2013, 12, 1), date(2014, 2, 28))
+        moments = [
+            datetime(2013, 12, 20) + timedelta(hours=h)
+            for h in range(0, 24 * 40, 11)
+        ] + [datetime(2014, 1, 16, 9), datetime(2014, 1, 16, 17)]
+        for start in moments:
+            for end in moments:
+                self.assertEqual(
+                    indexed.businesstimedelta(start, end),
+                    self.bt.businesstimedelta(start, end))
+
+    def test_compiled_index_outside_range(self):
+        bt = BusinessTime(holidays=USFederalHolidays())
+        bt.compile_index(date(2014, 1, 1), date(2014, 1, 31))
+        start = datetime(2013, 12, 30, 12)
+        end = datetime(2014, 1, 3, 10)
+        self.assertEqual(
+            bt.businesstimedelta(start, end), timedelta(days=2, hours=6))
+
+    def test_businesstimedelta_after_hours_to_after_hours_next_day(self):
+        start = datetime(2014, 1, 9, 18)
+        end = datetime(2014, 1, 10, 18)
+        self.assertEqual(
+            self.bt.businesstimedelta(start, end), timedelta(hours=8))
+        start = datetime(2014, 1, 17, 18)
+        end = datetime(2014, 1, 21, 18)
+        self.assertEqual(
+            self.bt.businesstimedelta(start, end), timedelta(hours=8))
+
+    def test_add_businesstime(self):
+        start = datetime(2014, 1, 16, 12)
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(hours=5)),
+            datetime(2014, 1, 16, 17))
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(hours=6)),
+            datetime(2014, 1, 17, 10))
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(days=1, hours=6)),
+            datetime(2014, 1, 21, 10))
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta()), start)
+
+    def test_add_businesstime_outside_business_hours(self):
+        self.assertEqual(
+            self.bt.add_businesstime(
+                datetime(2014, 1, 18, 12), timedelta(hours=8)),
+            datetime(2014, 1, 21, 17))
+        self.assertEqual(
+            self.bt.add_businesstime(
+                datetime(2014, 1, 16, 18), timedelta(minutes=1)),
+            datetime(2014, 1, 17, 9, 1))
+
+    def test_add_businesstime_negative(self):
+        start = datetime(2014, 1, 21, 10)
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(hours=-1)),
+            datetime(2014, 1, 21, 9))
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(hours=-2)),
+            datetime(2014, 1, 17, 16))
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(days=-12, hours=-1)),
+            datetime(2014, 1, 2, 9))
+
+    def test_add_businesstime_inverts_businesstimedelta(self):
+        start = datetime(2013, 12, 20, 11, 30)
+        for end in [
+                datetime(2013, 12, 24, 16),
+                datetime(2014, 1, 2, 9, 15),
+                datetime(2015, 7, 6, 13)
+        ]:
+            delta = self.bt.businesstimedelta(start, end)
+            self.assertEqual(self.bt.add_businesstime(start, delta), end)
+            self.assertEqual(self.bt.add_businesstime(end, -delta), start)
+
+    def test_freeze(self):
+        frozen = self.bt.freeze(date(2013, 12, 1), date(2014, 2, 28))
+        start = datetime(2013, 12, 30, 12)
+        end = datetime(2014, 1, 21, 10)
+        self.assertEqual(
+            frozen.businesstimedelta(start, end),
+            self.bt.businesstimedelta(start, end))
+        self.assertEqual(
+            frozen.businesstime_hours(start, end),
+            self.bt.businesstime_hours(start, end))
+        self.assertEqual(
+            tuple(frozen.iterbusinessdays(start, end)),
+            tuple(self.bt.iterbusinessdays(start, end)))
+        self.assertTrue(frozen.isholiday(date(2014, 1, 20)))
+        self.assertEqual(
+            frozen.add_businesstime(start, timedelta(days=3)),
+            datetime(2014, 1, 3, 12))
+
+    def test_freeze_is_read_only(self):
+        frozen = self.bt.freeze(date(2014, 1, 1), date(2014, 1, 31))
+        self.assertFalse(hasattr(frozen, '__dict__'))
+        with self.assertRaises(AttributeError):
+            frozen.weekends = (6, )
+        with self.assertRaises(AttributeError):
+            frozen.anything = 1
+
+    def test_freeze_outside_range(self):
+        frozen = self.bt.freeze(date(2014, 1, 1), date(2014, 1, 31))
+        with self.assertRaises(ValueError):
+            frozen.isholiday(date(2014, 2, 17))
+        with self.assertRaises(ValueError):
+            frozen.businesstimedelta(
+                datetime(2014, 1, 30, 12), datetime(2014, 2, 3, 12))
+
+    def test_freeze_shared_between_threads(self):
+        frozen = self.bt.freeze(date(2013, 1, 1), date(2015, 12, 31))
+        start = datetime(2013, 3, 4, 10)
+        expected = [
+            self.bt.businesstimedelta(start, start + timedelta(days=days))
+            for days in range(0, 900, 9)
+        ]
+        results = []
+
+        def work():
+            results.append([
+                frozen.businesstimedelta(start, start + timedelta(days=days))
+                for days in range(0, 900, 9)
+            ])
+
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [expected] * 4)
+
+    def test_stats(self):
+        bt = BusinessTime(holidays=USFederalHolidays())
+        self.assertIsNone(bt.stats())
+        calls = []
+        bt.enable_stats(hook=lambda name, elapsed, args: calls.append(name))
+        bt.businesstimedelta(
+            datetime(2014, 1, 16, 18, 30), datetime(2014, 1, 22, 10))
+        list(bt.iterbusinessdays(datetime(2014, 1, 16), datetime(2014, 1, 22)))
+        bt.isholiday(date(2013, 12, 25))
+        stats = bt.stats()
+        self.assertEqual(stats['calls']['businesstimedelta'], 1)
+        self.assertEqual(stats['span_days'], 5)
+        self.assertEqual(stats['days_yielded']['iterbusinessdays'], 3)
+        self.assertEqual(stats['holiday_cache']['misses'], 2)
+        self.assertIn('businesstimedelta', stats['seconds'])
+        self.assertIn('businesstimedelta', calls)
+
+        bt.reset_stats()
+        self.assertEqual(bt.stats()['calls'], {})
+        bt.disable_stats()
+        self.assertIsNone(bt.stats())
+        self.assertNotIn('businesstimedelta', bt.__dict__)
+
+    def test_schedule_lunch_break(self):
+        bt = BusinessTime(business_hours=Schedule([(time(9), time(12)),
+                                                   (time(13), time(17))]))
+        self.assertEqual(bt.open_hours, timedelta(hours=7))
+        self.assertFalse(bt.isduringbusinesshours(datetime(2014, 1, 13, 12, 30)))
+        self.assertTrue(bt.isduringbusinesshours(datetime(2014, 1, 13, 13)))
+        self.assertEqual(
+            bt.businesstimedelta(
+                datetime(2014, 1, 13, 11), datetime(2014, 1, 13, 14)),
+            timedelta(hours=2))
+        self.assertEqual(
+            bt.businesstimedelta(
+                datetime(2014, 1, 13, 10), datetime(2014, 1, 14, 10)),
+            timedelta(days=1))
+        self.assertEqual(
+            bt.add_businesstime(datetime(2014, 1, 13, 11), timedelta(hours=2)),
+            datetime(2014, 1, 13, 14))
+
+    def test_schedule_per_weekday(self):
+        full = (time(9), time(17))
+        bt = BusinessTime(business_hours=Schedule({
+            0: full, 1: full, 2: full, 3: full, 4: (time(9), time(13))
+        }))
+        self.assertEqual(
+            bt.businesstimedelta(
+                datetime(2014, 1, 17, 12), datetime(2014, 1, 20, 10)),
+            timedelta(hours=2))
+        self.assertEqual(
+            bt.businesstime_hours(
+                datetime(2014, 1, 13, 9), datetime(2014, 1, 20, 9)),
+            timedelta(hours=36))
+        self.assertEqual(
+            bt.add_businesstime(datetime(2014, 1, 17, 12), timedelta(hours=2)),
+            datetime(2014, 1, 20, 10))
+
+    def test_schedule_exceptions(self):
+        bt = BusinessTime(
+            business_hours=Schedule(
+                (time(9), time(17)),
+                exceptions={date(2013, 12, 24): (time(9), time(13))}),
+            holidays=USFederalHolidays())
+        self.assertFalse(bt.isduringbusinesshours(datetime(2013, 12, 24, 14)))
+        self.assertEqual(
+            bt.businesstimedelta(
+                datetime(2013, 12, 24, 9), datetime(2013, 12, 26, 9)),
+            timedelta(hours=4))
+        self.assertEqual(
+            bt.add_businesstime(datetime(2013, 12, 26, 10), -timedelta(hours=2)),
+            datetime(2013, 12, 24, 12))
+        calendar = bt.freeze(date(2013, 12, 1), date(2014, 1, 31))
+        self.assertEqual(
+            calendar.businesstimedelta(
+                datetime(2013, 12, 23, 9), datetime(2013, 12, 27, 9)),
+            timedelta(days=2, hours=4))
+
+    def test_holidays_between(self):
+        bt = BusinessTime(holidays=USFederalHolidays())
+        self.assertEqual(
+            bt.holidays_between(datetime(2013, 12, 1), datetime(2014, 1, 21)),
+            [date(2013, 12, 25), date(2014, 1, 1), date(2014, 1, 20)])
+        bt = BusinessTime(holidays=[date(2014, 1, 2), date(2013, 12, 24)])
+        self.assertEqual(
+            bt.holidays_between(date(2013, 12, 1), date(2014, 1, 2)),
+            [date(2013, 12, 24)])
+        self.assertEqual(BusinessTime().holidays_between(
+            date(2013, 12, 1), date(2014, 1, 2)), [])
+
+    def test_compiled_index_is_compact(self):
+        bt = BusinessTime(holidays=USFederalHolidays())
+        index = bt.compile_index(date(1950, 1, 1), date(2049, 12, 31))
+        self.assertLess(index.nbytes, 6000)
+        first, last = date(1990, 3, 7).toordinal(), date(2031, 6, 2).toordinal()
+        plain = BusinessTime(holidays=USFederalHolidays())
+        self.assertEqual(
+            index.count(first, last), plain._count_businessdays(first, last))
+        self.assertEqual(
+            index.nth(first, 5000), plain._nth_businessday(first, 5000))
+        self.assertEqual(
+            index.nth(last, 5000, -1), plain._nth_businessday(last, 5000, -1))
+
+    def test_next_business_day(self):
+        self.assertEqual(
+            self.bt.next_business_day(date(2013, 12, 24)),
+            datetime(2013, 12, 26))
+        self.assertEqual(
+            self.bt.next_business_day(datetime(2013, 12, 31, 10)),
+            datetime(2014, 1, 2))
+
+    def test_next_business_open(self):
+        self.assertEqual(
+            self.bt.next_business_open(datetime(2013, 12, 24, 18)),
+            datetime(2013, 12, 26, 9))
+        self.assertEqual(
+            self.bt.next_business_open(datetime(2013, 12, 27, 17)),
+            datetime(2013, 12, 30, 9))
+        self.assertEqual(
+            self.bt.next_business_open(datetime(2013, 12, 27, 8)),
+            datetime(2013, 12, 27, 9))
+        self.assertEqual(
+            self.bt.next_business_open(datetime(2013, 12, 27, 10, 30)),
+            datetime(2013, 12, 27, 10, 30))
+        bt = BusinessTime(business_hours=Schedule([(time(9), time(12)),
+                                                   (time(13), time(17))]))
+        self.assertEqual(
+            bt.next_business_open(datetime(2014, 1, 13, 12, 30)),
+            datetime(2014, 1, 13, 13))
+
+    def test_previous_business_close(self):
+        self.assertEqual(
+            self.bt.previous_business_close(datetime(2014, 1, 2, 8)),
+            datetime(2013, 12, 31, 17))
+        self.assertEqual(
+            self.bt.previous_business_close(datetime(2014, 1, 2, 9)),
+            datetime(2013, 12, 31, 17))
+        self.assertEqual(
+            self.bt.previous_business_close(datetime(2014, 1, 2, 17, 30)),
+            datetime(2014, 1, 2, 17))
+        self.assertEqual(
+            self.bt.previous_business_close(datetime(2014, 1, 2, 10, 30)),
+            datetime(2014, 1, 2, 10, 30))
+
+    def test_shared(self):
+        self.addCleanup(businesstime.shared_calendars.clear)
+        bt = BusinessTime.shared(holidays=USFederalHolidays())
+        self.assertIs(BusinessTime.shared(holidays=USFederalHolidays()), bt)
+        self.assertIsNot(
+            BusinessTime.shared(weekends=(4, 5), holidays=USFederalHolidays()),
+            bt)
+        self.assertIsNot(BusinessTime.shared(), bt)
+        holidays = [date(2014, 1, 2)]
+        self.assertIs(
+            BusinessTime.shared(holidays=holidays),
+            BusinessTime.shared(holidays=list(holidays)))
+
+        BusinessTime.invalidate_shared(holidays=USFederalHolidays())
+        self.assertIsNot(BusinessTime.shared(holidays=USFederalHolidays()), bt)
+
+    def test_shared_is_read_only(self):
+        self.addCleanup(businesstime.shared_calendars.clear)
+        shared = BusinessTime.shared(holidays=USFederalHolidays())
+        self.assertFalse(hasattr(shared, 'enable_stats'))
+        self.assertFalse(hasattr(shared, 'compile_index'))
+        self.assertRaises(AttributeError, setattr, shared, '_index', None)
+        self.assertNotIsInstance(shared, businesstime.CompiledCalendar)
+        self.assertEqual(
+            shared.businesstimedelta(datetime(2013, 12, 31, 12),
+                                     datetime(2014, 1, 21, 12)),
+            self.bt.businesstimedelta(datetime(2013, 12, 31, 12),
+                                      datetime(2014, 1, 21, 12)))
+        self.assertTrue(shared.holiday_cache_info().misses > 0)
+
+    def test_shared_is_bounded(self):
+        self.addCleanup(setattr, businesstime.shared_calendars, 'maxsize',
+                        businesstime.shared_calendars.maxsize)
+        self.addCleanup(businesstime.shared_calendars.clear)
+        businesstime.shared_calendars.maxsize = 2
+        first = BusinessTime.shared(weekends=(6, ))
+        BusinessTime.shared(weekends=(5, ))
+        BusinessTime.shared(weekends=(4, ))
+        self.assertEqual(len(businesstime.shared_calendars), 2)
+        self.assertIsNot(BusinessTime.shared(weekends=(6, )), first)
+
+    def test_iter_businesstimedelta(self):
+        bt = BusinessTime(holidays=USFederalHolidays())
+        starts = [datetime(2013, 12, 20, 8) + timedelta(hours=7 * i)
+                  for i in range(120)]
+        pairs = [(start, start + timedelta(hours=(i * 37) % 500 - 100))
+                 for i, start in enumerate(starts)]
+        # One pair out of order is worked out on its own
+        pairs.insert(60, (datetime(2013, 12, 24, 12), datetime(2014, 1, 2, 10)))
+        results = bt.iter_businesstimedelta(iter(pairs))
+        self.assertEqual(
+            list(results), [bt.businesstimedelta(d1, d2) for d1, d2 in pairs])
+
+    def test_business_clock(self):
+        clock = BusinessClock(self.bt, date(2014, 1, 1))
+        self.assertEqual(clock.position(datetime(2014, 1, 2, 12)),
+                         3 * 3600 * 1000000)
+        self.assertEqual(clock.position(datetime(2014, 1, 6, 9)),
+                         16 * 3600 * 1000000)
+        self.assertEqual(clock.position(datetime(2013, 12, 31, 16)),
+                         -3600 * 1000000)
+
+    def test_sla_tracker(self):
+        tracker = SLATracker(self.bt, datetime(2014, 1, 2, 10))
+        tracker.add('a', datetime(2013, 12, 30, 12))
+        tracker.add('b', datetime(2014, 1, 2, 9))
+        tracker.add('c', datetime(2013, 12, 31, 18))
+        self.assertEqual(tracker.age('b'), timedelta(hours=1))
+        self.assertEqual(tracker.oldest(), ('a', timedelta(days=1, hours=6)))
+        self.assertEqual(tracker.count_over(timedelta(hours=1)), 1)
+
+        tracker.advance(datetime(2014, 1, 6, 9))
+        for key, opened_at in [('a', datetime(2013, 12, 30, 12)),
+                               ('b', datetime(2014, 1, 2, 9)),
+                               ('c', datetime(2013, 12, 31, 18))]:
+            self.assertEqual(
+                tracker.age(key),
+                self.bt.businesstimedelta(opened_at, datetime(2014, 1, 6, 9)))
+        self.assertEqual(tracker.over(timedelta(days=2)), ['a'])
+        self.assertEqual(tracker.over(timedelta(hours=12)), ['a', 'b', 'c'])
+
+        tracker.remove('a')
+        self.assertEqual(tracker.oldest()[0], 'b')
+        self.assertEqual(len(tracker), 2)
+        self.assertRaises(KeyError, tracker.remove, 'a')
+
+    def test_deadline_scheduler(self):
+        scheduler = DeadlineScheduler(self.bt)
+        self.assertEqual(
+            scheduler.add('a', datetime(2013, 12, 31, 16), timedelta(hours=2)),
+            datetime(2014, 1, 2, 10))
+        self.assertEqual(
+            scheduler.add('b', datetime(2014, 1, 2, 9), timedelta(hours=8)),
+            datetime(2014, 1, 2, 17))
+        scheduler.add('c', datetime(2014, 1, 2, 9), timedelta(days=1))
+        scheduler.add('d', datetime(2014, 1, 2, 9), timedelta(hours=1))
+        scheduler.remove('d')
+        self.assertEqual(scheduler.next_deadline(),
+                         ('a', datetime(2014, 1, 2, 10)))
+
+        self.assertEqual(list(scheduler.breaches(datetime(2014, 1, 2, 10))), [])
+        self.assertEqual(list(scheduler.breaches(datetime(2014, 1, 2, 11))),
+                         [('a', datetime(2014, 1, 2, 10))])
+        # Nothing more has passed by the next opening after a deadline at
+        # closing time
+        self.assertEqual(list(scheduler.breaches(datetime(2014, 1, 3, 9))), [])
+        self.assertEqual(
+            list(scheduler.breaches(datetime(2014, 1, 3, 9, 1))),
+            [('b', datetime(2014, 1, 2, 17)), ('c', datetime(2014, 1, 2, 17))])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_composite_calendar(self):
+        london = BusinessTime(business_hours=(time(8), time(16)),
+                              holidays=[date(2014, 1, 1), date(2014, 1, 3)])
+        both = CompositeCalendar([self.bt, london], date(2013, 12, 1),
+                                 date(2014, 1, 31))
+        either = CompositeCalendar([self.bt, london], date(2013, 12, 1),
+                                   date(2014, 1, 31), how='any')
+        self.assertEqual(both.open_hours, timedelta(hours=7))
+        self.assertEqual(either.open_hours, timedelta(hours=9))
+        # Only New York is open on the 3rd and only London on the 20th
+        self.assertEqual(
+            list(both.iterbusinessdays(datetime(2014, 1, 1),
+                                       datetime(2014, 1, 8))),
+            [datetime(2014, 1, 2), datetime(2014, 1, 6), datetime(2014, 1, 7)])
+        self.assertEqual(
+            both.businesstimedelta(datetime(2014, 1, 17, 12),
+                                   datetime(2014, 1, 21, 12)),
+            timedelta(days=1))
+        self.assertEqual(
+            either.businesstimedelta(datetime(2014, 1, 17, 12),
+                                     datetime(2014, 1, 21, 12)),
+            timedelta(days=1, hours=8))
+        self.assertTrue(either.isduringbusinesshours(datetime(2014, 1, 3, 16)))
+        self.assertFalse(both.isduringbusinesshours(datetime(2014, 1, 3, 10)))
+        self.assertRaises(ValueError, both.isbusinessday, date(2014, 2, 3))
+        self.assertRaises(
+            ValueError, CompositeCalendar,
+            [self.bt, BusinessTime(business_hours=(time(17), time(18)))],
+            date(2014, 1, 1), date(2014, 1, 31))
+
+    def test_iter_business_intervals(self):
+        intervals = self.bt.iter_business_intervals(datetime(2013, 12, 31, 12),
+                                                    datetime(2014, 1, 6, 10))
+        self.assertEqual(list(intervals), [
+            (datetime(2013, 12, 31, 12), datetime(2013, 12, 31, 17)),
+            (datetime(2014, 1, 2, 9), datetime(2014, 1, 2, 17)),
+            (datetime(2014, 1, 3, 9), datetime(2014, 1, 3, 17)),
+            (datetime(2014, 1, 6, 9), datetime(2014, 1, 6, 10)),
+        ])
+        self.assertEqual(
+            list(self.bt.iter_business_intervals(datetime(2014, 1, 2, 18),
+                                                 datetime(2014, 1, 2, 12))),
+            [])
+
+    def test_iter_business_intervals_with_breaks(self):
+        bt = BusinessTime(business_hours=Schedule(
+            [(time(9), time(12)), (time(13), time(17))]))
+        self.assertEqual(
+            list(bt.iter_business_intervals(datetime(2014, 1, 3, 10),
+                                            datetime(2014, 1, 6, 12, 30))),
+            [(datetime(2014, 1, 3, 10), datetime(2014, 1, 3, 12)),
+             (datetime(2014, 1, 3, 13), datetime(2014, 1, 3, 17)),
+             (datetime(2014, 1, 6, 9), datetime(2014, 1, 6, 12))])
+
+    def test_aware_datetimes_keep_tzinfo(self):
+        tz = FixedOffset()
+        start = datetime(2013, 12, 31, 16, tzinfo=tz)
+        self.assertEqual(
+            self.bt.add_businesstime(start, timedelta(hours=2)),
+            datetime(2014, 1, 2, 10, tzinfo=tz))
+        self.assertEqual(
+            self.bt.add_businesstime(start, -timedelta(hours=8)),
+            datetime(2013, 12, 30, 16, tzinfo=tz))
+        self.assertEqual(self.bt.next_business_open(start), start)
+        self.assertEqual(
+            self.bt.next_business_open(datetime(2013, 12, 31, 18, tzinfo=tz)),
+            datetime(2014, 1, 2, 9, tzinfo=tz))
+        self.assertEqual(
+            self.bt.previous_business_close(
+                datetime(2014, 1, 1, 12, tzinfo=tz)),
+            datetime(2013, 12, 31, 17, tzinfo=tz))
+        self.assertEqual(
+            self.bt.next_business_day(start), datetime(2014, 1, 2, tzinfo=tz))
+        self.assertEqual(
+            list(self.bt.iter_business_intervals(
+                start, datetime(2014, 1, 2, 10, tzinfo=tz))),
+            [(start, datetime(2013, 12, 31, 17, tzinfo=tz)),
+             (datetime(2014, 1, 2, 9, tzinfo=tz),
+              datetime(2014, 1, 2, 10, tzinfo=tz))])
+
+        scheduler = DeadlineScheduler(self.bt)
+        scheduler.add('a', start, timedelta(hours=2))
+        self.assertEqual(
+            list(scheduler.breaches(datetime(2014, 1, 2, 11, tzinfo=tz))),
+            [('a', datetime(2014, 1, 2, 10, tzinfo=tz))])
+
+    def test_next_business_open_with_no_hours_left(self):
+        bt = BusinessTime(business_hours=Schedule(
+            {5: (time(9), time(17))}, {date(2014, 1, 2): (time(9), time(17))}))
+        self.assertEqual(bt.next_business_open(datetime(2014, 1, 1)),
+                         datetime(2014, 1, 2, 9))
+        self.assertEqual(bt.previous_business_close(datetime(2014, 1, 3)),
+                         datetime(2014, 1, 2, 17))
+        self.assertRaises(ValueError, bt.next_business_open,
+                          datetime(2014, 1, 3))
+        self.assertRaises(ValueError, bt.previous_business_close,
+                          datetime(2014, 1, 1))
+
+    def test_business_hours_only_on_weekends(self):
+        self.assertRaises(
+            ValueError, BusinessTime,
+            business_hours=Schedule({5: (time(9), time(17))}))
+        self.assertRaises(
+            ValueError, BusinessTime,
+            business_hours=Schedule({5: (time(9), time(17))},
+                                    {date(2014, 1, 4): (time(9), time(12))}))
+        bt = BusinessTime(business_hours=Schedule({5: (time(9), time(17))}),
+                          weekends=(6, ))
+        self.assertEqual(
+            bt.businesstimedelta(datetime(2014, 1, 4, 9),
+                                 datetime(2014, 1, 4, 12)),
+            timedelta(hours=3))
+
+    def test_holidays_given_as_datetimes(self):
+        bt = BusinessTime(holidays=[datetime(2014, 1, 1)])
+        self.assertTrue(bt.isholiday(date(2014, 1, 1)))
+        self.assertEqual(
+            bt.businesstimedelta(datetime(2013, 12, 30, 10),
+                                 datetime(2014, 1, 3, 10)),
+            timedelta(days=3))
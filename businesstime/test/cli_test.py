@@ -0,0 +1,74 @@
+from datetime import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from businesstime import cli
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_parse_datetime(self):
+        self.assertEqual(
+            cli.parse_datetime('2014-01-16T18:30:00'),
+            datetime(2014, 1, 16, 18, 30))
+        self.assertEqual(
+            cli.parse_datetime('2014-01-16 18:30'),
+            datetime(2014, 1, 16, 18, 30))
+        self.assertEqual(
+            cli.parse_datetime(1390384800), datetime(2014, 1, 22, 10))
+        self.assertRaises(ValueError, cli.parse_datetime, 'yesterday')
+
+    def test_csv(self):
+        path = self.write(
+            'in.csv', 'id,start,end\n'
+            '1,2014-01-16 18:30,2014-01-22 10:00\n'
+            '2,2014-01-03 09:10,2014-01-02 09:12\n')
+        out = os.path.join(self.tmpdir, 'out.csv')
+        for workers in ('1', '2'):
+            cli.main([
+                path, '-o', out, '--holidays', 'us', '--workers', workers,
+                '--chunk-size', '1', '--max-pending', '1'
+            ])
+            self.assertEqual(
+                self.read(out).splitlines(), [
+                    'id,start,end,business_seconds',
+                    '1,2014-01-16 18:30,2014-01-22 10:00,61200',
+                    '2,2014-01-03 09:10,2014-01-02 09:12,-28680',
+                ])
+
+    def test_empty_csv(self):
+        path = self.write('in.csv', '')
+        out = os.path.join(self.tmpdir, 'out.csv')
+        cli.main([path, '-o', out, '--workers', '1'])
+        self.assertEqual(self.read(out), '')
+
+    def test_jsonl(self):
+        path = self.write(
+            'in.jsonl', '{"opened": "2014-01-16T09:00:00", "closed": '
+            '"2014-01-17T15:00:00"}\n')
+        out = os.path.join(self.tmpdir, 'out.jsonl')
+        cli.main([
+            path, '-o', out, '--workers', '1', '--start-field', 'opened',
+            '--end-field', 'closed', '--open', '08:00', '--close', '16:00',
+            '--index', '2014-2014'
+        ])
+        self.assertEqual(
+            json.loads(self.read(out))['business_seconds'], 14 * 3600)
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 import unittest
 
 from businesstime.holidays.aus import QueenslandPublicHolidays, BrisbanePublicHolidays
@@ -10,6 +10,29 @@ class QueenslandPublicHolidaysTest(unittest.TestCase):
         self.assertEqual(
             list(holidays_gen(date(2016, 8, 1), end=date(2016, 8, 31))), [])
 
+    def test_isholiday_override(self):
+        class ExtraHolidays(BrisbanePublicHolidays):
+            def isholiday(self, dt):
+                return dt == date(2016, 8, 1) or super(
+                    ExtraHolidays, self).isholiday(dt)
+
+        holidays = ExtraHolidays()
+        self.assertEqual(
+            list(holidays(date(2016, 8, 1), end=date(2016, 8, 31))),
+            [date(2016, 8, 1), date(2016, 8, 10)])
+        self.assertEqual(
+            holidays.holidays_between(date(2016, 8, 1), date(2016, 8, 31)),
+            [date(2016, 8, 1), date(2016, 8, 10)])
+
+    def test_isholiday(self):
+        holidays = QueenslandPublicHolidays()
+        self.assertTrue(holidays.isholiday(date(2016, 12, 27)))
+        self.assertTrue(holidays.isholiday(datetime(2016, 12, 27, 10)))
+        self.assertFalse(holidays.isholiday(date(2016, 8, 10)))
+        self.assertTrue(BrisbanePublicHolidays().isholiday(date(2016, 8, 10)))
+        self.assertRaises(NotImplementedError, holidays.isholiday,
+                          date(2012, 12, 25))
+
 
 class BrisbanePublicHolidaysTest(unittest.TestCase):
     def test_2016_08(self):
@@ -18,6 +41,15 @@ class BrisbanePublicHolidaysTest(unittest.TestCase):
             list(holidays_gen(date(2016, 8, 1), end=date(2016, 8, 31))),
             [date(2016, 8, 10)])
 
+    def test_holidays_between(self):
+        holidays = BrisbanePublicHolidays()
+        self.assertEqual(
+            holidays.holidays_between(date(2014, 11, 1), date(2015, 1, 2)),
+            [date(2014, 11, 14), date(2014, 12, 25), date(2014, 12, 26),
+             date(2015, 1, 1)])
+        self.assertRaises(NotImplementedError, holidays.holidays_between,
+                          date(2019, 12, 1), date(2020, 1, 2))
+
     def test_out_of_range(self):
         holidays_gen = BrisbanePublicHolidays()
 
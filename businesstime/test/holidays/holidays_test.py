@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, tzinfo
+import unittest
+
+from businesstime.holidays import Holidays, OBSERVED_MONDAY
+
+
+class ExampleHolidays(Holidays):
+    rules = [
+        dict(name="Leap Day", month=2, day=29),
+        dict(name="Last Friday of March", month=3, weekday=4, week=-1),
+        dict(name="Fifth Friday of March", month=3, weekday=4, week=5),
+        dict(name="Second Tuesday of May", month=5, weekday=1, week=2),
+    ]
+
+
+class FixedOffset(tzinfo):
+    def utcoffset(self, dt):
+        return timedelta(hours=10)
+
+    def dst(self, dt):
+        return timedelta(0)
+
+
+class HolidaysTest(unittest.TestCase):
+    def test_compiled_rules_match_rule_checks(self):
+        holidays = ExampleHolidays()
+        curr, end = date(2010, 1, 1), date(2030, 1, 1)
+        expected = []
+        while curr < end:
+            if holidays._rules_match(curr):
+                expected.append(curr)
+            curr += timedelta(days=1)
+        self.assertEqual(
+            list(holidays(date(2010, 1, 1), end=date(2030, 1, 1))), expected)
+
+    def test_2015(self):
+        holidays = ExampleHolidays()
+        self.assertEqual(
+            list(holidays(date(2015, 1, 1), end=date(2016, 1, 1))),
+            [date(2015, 3, 27), date(2015, 5, 12)])
+        self.assertTrue(holidays.isholiday(date(2015, 3, 27)))
+        self.assertTrue(holidays.isholiday(datetime(2015, 3, 27, 12)))
+        self.assertFalse(holidays.isholiday(date(2015, 3, 20)))
+
+    def test_datetimes_keep_time_of_day(self):
+        holidays = ExampleHolidays()
+        self.assertEqual(
+            list(
+                holidays(
+                    datetime(2016, 2, 28, 10), end=datetime(2016, 4, 1, 9))),
+            [datetime(2016, 2, 29, 10), datetime(2016, 3, 25, 10)])
+        tz = FixedOffset()
+        self.assertEqual(
+            list(
+                holidays(
+                    datetime(2016, 2, 28, 10, tzinfo=tz),
+                    end=datetime(2017, 3, 1, 9, tzinfo=tz))),
+            [datetime(2016, 2, 29, 10, tzinfo=tz),
+             datetime(2016, 3, 25, 10, tzinfo=tz),
+             datetime(2016, 5, 10, 10, tzinfo=tz)])
+
+    def test_isholiday_override_calling_super(self):
+        class ExtraHolidays(ExampleHolidays):
+            def isholiday(self, dt):
+                return dt == date(2015, 3, 3) or super(
+                    ExtraHolidays, self).isholiday(dt)
+
+        holidays = ExtraHolidays()
+        self.assertTrue(holidays.isholiday(date(2015, 3, 3)))
+        self.assertTrue(holidays.isholiday(date(2015, 3, 27)))
+        self.assertEqual(
+            list(holidays(date(2015, 1, 1), end=date(2016, 1, 1))),
+            [date(2015, 3, 3), date(2015, 3, 27), date(2015, 5, 12)])
+
+    def test_holidays_between(self):
+        holidays = ExampleHolidays()
+        self.assertEqual(
+            holidays.holidays_between(date(2015, 3, 27), date(2016, 3, 25)),
+            list(holidays(date(2015, 3, 27), end=date(2016, 3, 25))))
+        self.assertEqual(
+            holidays.holidays_between(
+                datetime(2016, 2, 28, 10), datetime(2016, 4, 1, 9)),
+            [date(2016, 2, 29), date(2016, 3, 25)])
+        self.assertEqual(
+            holidays.holidays_between(date(2016, 4, 1), date(2016, 2, 1)), [])
+
+    def test_observed_monday(self):
+        class MondayHolidays(Holidays):
+            rules = [dict(name="Boxing Day", month=12, day=26,
+                          observed=OBSERVED_MONDAY)]
+
+        holidays = MondayHolidays()
+        self.assertEqual(
+            holidays.holidays_between(date(2020, 12, 1), date(2022, 1, 1)),
+            [date(2020, 12, 26), date(2020, 12, 28), date(2021, 12, 26),
+             date(2021, 12, 27)])
+        self.assertTrue(holidays._rules_match(date(2020, 12, 28)))
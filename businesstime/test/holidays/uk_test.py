@@ -1,9 +1,12 @@
-from datetime import date
+from datetime import date, datetime
+import os
+import shutil
+import tempfile
 import unittest
 
 from businesstime.holidays.uk import (
     EnglandHolidays, WalesHolidays, ScotlandHolidays,
-    NorthernIrelandHolidays,
+    NorthernIrelandHolidays, write_snapshot,
 )
 
 
@@ -17,6 +20,21 @@ class EnglandHolidaysTest(unittest.TestCase):
         )
 
 
+    def test_isholiday_override(self):
+        class ExtraHolidays(EnglandHolidays):
+            def isholiday(self, dt):
+                return dt == date(2014, 3, 3) or super(
+                    ExtraHolidays, self).isholiday(dt)
+
+        holidays = ExtraHolidays()
+        self.assertEqual(
+            list(holidays(date(2014, 3, 1), end=date(2014, 4, 30))),
+            [date(2014, 3, 3), date(2014, 4, 18), date(2014, 4, 21)])
+        self.assertEqual(
+            holidays.holidays_between(date(2014, 3, 1), date(2014, 3, 5)),
+            [date(2014, 3, 3)])
+
+
 class WalesHolidaysTest(unittest.TestCase):
     holidays = WalesHolidays()
 
@@ -51,3 +69,31 @@ class NorthernIrelandHolidaysTest(unittest.TestCase):
             list(self.holidays(date(2012, 7, 1), end=date(2012, 7, 31))),
             [date(2012, 7, 12)]
         )
+
+
+class UKHolidaysDataTest(unittest.TestCase):
+    def test_parsed_once_and_shared(self):
+        self.assertIs(EnglandHolidays().holidays, WalesHolidays().holidays)
+        self.assertIs(ScotlandHolidays()._division_holidays,
+                      ScotlandHolidays()._division_holidays)
+        self.assertTrue(
+            ScotlandHolidays().isholiday(datetime(2012, 1, 3, 12)))
+
+    def test_holidays_between(self):
+        self.assertEqual(
+            ScotlandHolidays().holidays_between(
+                date(2012, 1, 1), date(2012, 1, 3)), [date(2012, 1, 2)])
+
+    def test_snapshot(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'uk-bank-holidays.bin')
+        write_snapshot(path)
+        for cls in (EnglandHolidays, ScotlandHolidays,
+                    NorthernIrelandHolidays):
+            self.assertEqual(
+                cls(holidays_filepath=path).holidays, cls().holidays)
+        self.assertEqual(
+            list(NorthernIrelandHolidays(holidays_filepath=path)(
+                date(2012, 7, 1), end=date(2012, 7, 31))),
+            [date(2012, 7, 12)])
@@ -88,3 +88,14 @@ class USFederalHolidaysTest(unittest.TestCase):
                 date(2017, 11, 23),
                 date(2017, 12, 25)
             ])
+
+    def test_observed_across_new_year(self):
+        holidays_gen = USFederalHolidays()
+        self.assertEqual(
+            list(holidays_gen(date(2021, 12, 1), end=date(2022, 1, 4))), [
+                date(2021, 12, 24),
+                date(2021, 12, 25),
+                date(2021, 12, 31),
+                date(2022, 1, 1)
+            ])
+        self.assertTrue(holidays_gen.isholiday(date(2021, 12, 31)))
@@ -0,0 +1,93 @@
+from datetime import datetime, date, time, timedelta
+import unittest
+
+from businesstime import BusinessTime
+from businesstime.holidays.usa import USFederalHolidays
+from businesstime.schedule import Schedule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class VectorizedTest(unittest.TestCase):
+    def setUp(self):
+        self.bt = BusinessTime(holidays=USFederalHolidays())
+        moments = [
+            datetime(2013, 12, 20) + timedelta(hours=h)
+            for h in range(0, 24 * 40, 13)
+        ] + [datetime(2014, 1, 16, 9), datetime(2014, 1, 16, 17, 0, 0, 500)]
+        self.starts = [start for start in moments for end in moments]
+        self.ends = [end for start in moments for end in moments]
+
+    def test_businesstimedelta_many(self):
+        expected = [
+            int(self.bt.businesstimedelta(start, end).total_seconds())
+            for start, end in zip(self.starts, self.ends)
+        ]
+        result = self.bt.businesstimedelta_many(self.starts, self.ends)
+        self.assertEqual(result.dtype, numpy.int64)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_businesstimedelta_many_datetime64(self):
+        starts = numpy.array(['2014-01-16T09:00', '2014-01-17T12:00'],
+                             dtype='datetime64[m]')
+        ends = numpy.array(['2014-01-21T10:00', '2014-01-16T12:00'],
+                           dtype='datetime64[m]')
+        self.assertEqual(
+            self.bt.businesstimedelta_many(starts, ends).tolist(),
+            [2 * 86400 + 3600, -86400])
+
+    def test_businesstime_hours_many(self):
+        expected = [
+            int(self.bt.businesstime_hours(start, end).total_seconds())
+            for start, end in zip(self.starts, self.ends) if start <= end
+        ]
+        starts, ends = zip(*[(start, end)
+                             for start, end in zip(self.starts, self.ends)
+                             if start <= end])
+        self.assertEqual(
+            self.bt.businesstime_hours_many(starts, ends).tolist(), expected)
+
+    def test_list_holidays_and_weekends(self):
+        bt = BusinessTime(
+            business_hours=(time(8), time(16)),
+            weekends=(4, 5),
+            holidays=[date(2014, 1, 1)])
+        starts = [datetime(2013, 12, 30, 12), datetime(2014, 1, 2, 18)]
+        ends = [datetime(2014, 1, 5, 10), datetime(2014, 1, 5, 17)]
+        self.assertEqual(
+            bt.businesstimedelta_many(starts, ends).tolist(), [
+                int(bt.businesstimedelta(start, end).total_seconds())
+                for start, end in zip(starts, ends)
+            ])
+
+    def test_add_businesstime_many(self):
+        dts = self.starts[::7]
+        deltas = [
+            timedelta(minutes=(i * 97) % 9000 - 4500) for i in range(len(dts))
+        ]
+        expected = [
+            self.bt.add_businesstime(dt, delta)
+            for dt, delta in zip(dts, deltas)
+        ]
+        self.assertEqual(
+            self.bt.add_businesstime_many(dts, deltas).tolist(), expected)
+
+    def test_callable_weekends(self):
+        bt = BusinessTime(weekends=lambda dt: dt.day % 5 == 0)
+        starts = [datetime(2014, 1, 2, 12), datetime(2014, 1, 9, 18)]
+        ends = [datetime(2014, 1, 21, 10), datetime(2014, 1, 16, 11)]
+        self.assertEqual(
+            bt.businesstimedelta_many(starts, ends).tolist(), [
+                int(bt.businesstimedelta(start, end).total_seconds())
+                for start, end in zip(starts, ends)
+            ])
+
+    def test_split_schedule_not_supported(self):
+        bt = BusinessTime(business_hours=Schedule([(time(9), time(12)),
+                                                   (time(13), time(17))]))
+        with self.assertRaises(ValueError):
+            bt.businesstimedelta_many(self.starts, self.ends)
@@ -0,0 +1,131 @@
+"""
+Business age of a changing set of open items as the current time moves on.
+Every item's opening is read once on a BusinessClock, so its age at any
+moment is a subtraction, and advancing the current time only measures the
+days since the previous one. Openings are also kept sorted, so counting the
+items older than some age or finding the oldest is a bisection.
+"""
+import bisect
+
+from businesstime.clock import BusinessClock
+from businesstime.schedule import _time_to_microseconds
+
+# Clock cursors: one follows the current time, the other item openings
+_NOW = 0
+_OPENED = 1
+
+
+class SLATracker(object):
+    """
+    Open items, each added under a hashable key with the datetime it was
+    opened at, and their business age at the tracker's current time `now`.
+    Ages are what businesstimedelta(opened_at, now) returns; thresholds are
+    timedeltas read the same way, each day a full business day.
+    """
+
+    def __init__(self, businesstime, now):
+        self.businesstime = businesstime
+        self._clock = BusinessClock(businesstime, now.toordinal())
+        # key -> (position, time into its day, edge) of its opening
+        self._items = {}
+        # positions of the openings in ascending order, with their keys
+        self._positions = []
+        self._keys = []
+        self.advance(now)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __iter__(self):
+        """
+        Keys of the open items, oldest first
+        """
+        return iter(list(self._keys))
+
+    def _read(self, dt, cursor):
+        time = _time_to_microseconds(dt.time())
+        position, edge = self._clock.read(dt.toordinal(), time, cursor)
+        return position, time, edge
+
+    def advance(self, now):
+        """
+        Move the current time to now, normally later than the previous one
+        """
+        self.now = now
+        self._now = self._read(now, _NOW)
+
+    def add(self, key, opened_at):
+        """
+        Track key, opened at the datetime opened_at, replacing any item
+        already tracked under key
+        """
+        if key in self._items:
+            self.remove(key)
+        opened = self._read(opened_at, _OPENED)
+        self._items[key] = opened
+        index = bisect.bisect_right(self._positions, opened[0])
+        self._positions.insert(index, opened[0])
+        self._keys.insert(index, key)
+
+    def remove(self, key):
+        """
+        Stop tracking key. Raises KeyError when it is not tracked.
+        """
+        position = self._items.pop(key)[0]
+        index = bisect.bisect_left(self._positions, position)
+        while self._keys[index] != key:
+            index += 1
+        del self._positions[index]
+        del self._keys[index]
+
+    def discard(self, key):
+        if key in self._items:
+            self.remove(key)
+
+    def _age(self, opened):
+        bt = self.businesstime
+        position, time, edge = opened
+        now, nowtime, nowedge = self._now
+        if position <= now:
+            return bt._span_timedelta(
+                now - position, bt._iswhole(edge, time, nowedge, nowtime))
+        return -bt._span_timedelta(
+            position - now, bt._iswhole(nowedge, nowtime, edge, time))
+
+    def age(self, key):
+        """
+        businesstimedelta from key's opening to now
+        """
+        return self._age(self._items[key])
+
+    def _cutoff(self, threshold):
+        """
+        Number of items, oldest first, older than threshold
+        """
+        return bisect.bisect_left(
+            self._positions,
+            self._now[0] - self.businesstime._business_microseconds(threshold))
+
+    def count_over(self, threshold):
+        """
+        Number of items whose age is more than the timedelta threshold
+        """
+        return self._cutoff(threshold)
+
+    def over(self, threshold):
+        """
+        Keys of the items whose age is more than threshold, oldest first
+        """
+        return self._keys[:self._cutoff(threshold)]
+
+    def oldest(self):
+        """
+        (key, age) of the oldest item, or None when there are none
+        """
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return key, self.age(key)
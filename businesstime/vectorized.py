@@ -0,0 +1,211 @@
+"""
+Array versions of BusinessTime.businesstimedelta and
+BusinessTime.businesstime_hours. These need NumPy, which is an optional
+dependency: pip install businesstime[numpy]
+"""
+import datetime
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+MICROSECONDS_PER_SECOND = 1000000
+MICROSECONDS_PER_DAY = 86400 * MICROSECONDS_PER_SECOND
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError(
+            "businesstimedelta_many and businesstime_hours_many need numpy: "
+            "pip install businesstime[numpy]")
+
+
+def _business_hours(businesstime):
+    """
+    (opening, closing) in microseconds. The array functions only handle
+    calendars open for the same single interval on every business day.
+    """
+    intervals = set(
+        (tuple(hours.opens), tuple(hours.closes))
+        for weekday, hours in enumerate(businesstime._schedule.weekdays)
+        if businesstime._weekendpredicate is not None or
+        not businesstime._weekendmask >> weekday & 1)
+    if not businesstime._uniform or len(intervals) != 1:
+        raise ValueError("the array functions need the same business hours "
+                         "on every business day")
+    (opens, closes), = intervals
+    if len(opens) != 1:
+        raise ValueError("the array functions need business hours without "
+                         "breaks")
+    return opens[0], closes[0]
+
+
+def _busdaycalendar(businesstime, first, last):
+    """
+    numpy.busdaycalendar matching businesstime for first <= x <= last
+    """
+    end = last + datetime.timedelta(days=1)
+    holidays = [
+        dt.date() if isinstance(dt, datetime.datetime) else dt
+        for dt in businesstime._holidays.between(first, end)
+    ]
+    if businesstime._weekendpredicate is None:
+        weekmask = [
+            not businesstime._weekendmask >> weekday & 1
+            for weekday in range(7)
+        ]
+    else:
+        # Arbitrary rest days become holidays on an all-week calendar
+        weekmask = [True] * 7
+        holidays.extend(
+            datetime.date.fromordinal(ordinal)
+            for ordinal in range(first.toordinal(), end.toordinal())
+            if businesstime.isweekend(datetime.date.fromordinal(ordinal)))
+    return numpy.busdaycalendar(
+        weekmask=weekmask,
+        holidays=numpy.array(holidays, dtype='datetime64[D]'))
+
+
+def _business_parts(businesstime, starts, ends):
+    """
+    Returns (direction, days, elapsed) arrays such that businesstimedelta of
+    each pair is direction * timedelta(days=days, microseconds=elapsed)
+    """
+    _require_numpy()
+    starts = numpy.asarray(starts, dtype='datetime64[us]')
+    ends = numpy.asarray(ends, dtype='datetime64[us]')
+    starts, ends = numpy.broadcast_arrays(starts, ends)
+    direction = numpy.where(starts > ends, -1, 1)
+    d1 = numpy.minimum(starts, ends)
+    d2 = numpy.maximum(starts, ends)
+    if d1.size == 0:
+        zeros = numpy.zeros(d1.shape, dtype=numpy.int64)
+        return direction, zeros, zeros
+
+    opening, closing = _business_hours(businesstime)
+    one_day = numpy.timedelta64(1, 'D')
+
+    o1 = d1.astype('datetime64[D]')
+    o2 = d2.astype('datetime64[D]')
+    t1 = (d1 - o1).astype(numpy.int64)
+    t2 = (d2 - o2).astype(numpy.int64)
+
+    calendar = _busdaycalendar(businesstime, o1.min().item(),
+                               o2.max().item())
+    bd1 = numpy.is_busday(o1, busdaycal=calendar)
+    bd2 = numpy.is_busday(o2, busdaycal=calendar)
+
+    # Mirrors BaseBusinessTime._businesstimedelta, one array at a time
+    first = numpy.where(t1 > closing, o1 + one_day, o1)
+    businessdays = numpy.busday_count(
+        first, numpy.maximum(o2, o1 + one_day), busdaycal=calendar)
+    businessdays[(o1 == o2) & (t2 < opening)] = 0
+    empty = businessdays == 0
+
+    partial = numpy.where(
+        bd2 & (opening <= t2) & (t2 < closing), t2 - opening,
+        numpy.where(bd2 & (o1 != o2),
+                    numpy.maximum(0, numpy.minimum(t2, closing) - opening), 0))
+
+    start = numpy.where((first == o1) & bd1, numpy.maximum(t1, opening),
+                        opening)
+    ends_on_d2 = bd2 & (t2 >= opening)
+    end = numpy.where(ends_on_d2, numpy.minimum(t2, closing), closing)
+    businessdays = businessdays + (ends_on_d2 & (o2 != o1))
+
+    days = businessdays - 1
+    elapsed = end - start
+    borrow = elapsed < 0
+    days = days - borrow
+    elapsed = elapsed + borrow * (closing - opening)
+
+    days = numpy.where(empty, 0, days).astype(numpy.int64)
+    elapsed = numpy.where(empty, partial, elapsed).astype(numpy.int64)
+    return direction, days, elapsed
+
+
+def _to_seconds(direction, microseconds):
+    return direction * (microseconds // MICROSECONDS_PER_SECOND)
+
+
+def businesstimedelta_many(businesstime, starts, ends):
+    """
+    int64 array of businesstimedelta(start, end).total_seconds(), truncated
+    to whole seconds, for each start/end pair
+    """
+    direction, days, elapsed = _business_parts(businesstime, starts, ends)
+    return _to_seconds(direction, days * MICROSECONDS_PER_DAY + elapsed)
+
+
+def businesstime_hours_many(businesstime, starts, ends):
+    """
+    int64 array of business seconds for each start/end pair, counting every
+    full business day as the length of the business day
+    """
+    direction, days, elapsed = _business_parts(businesstime, starts, ends)
+    return _to_seconds(direction, days * businesstime._day_length + elapsed)
+
+
+def add_businesstime_many(businesstime, dts, deltas):
+    """
+    datetime64[us] array of add_businesstime(dt, delta) for each pair
+    """
+    _require_numpy()
+    dts = numpy.asarray(dts, dtype='datetime64[us]')
+    deltas = numpy.asarray(deltas, dtype='timedelta64[us]').astype(numpy.int64)
+    dts, deltas = numpy.broadcast_arrays(dts, deltas)
+    if dts.size == 0:
+        return dts.copy()
+
+    opening, closing = _business_hours(businesstime)
+    open_hours = closing - opening
+
+    # Same reading of a timedelta as BusinessTime._business_microseconds
+    direction = numpy.where(deltas < 0, -1, 1)
+    days, rest = numpy.divmod(numpy.abs(deltas), MICROSECONDS_PER_DAY)
+    remaining = days * open_hours + rest
+
+    ordinals = dts.astype('datetime64[D]')
+    time = (dts - ordinals).astype(numpy.int64)
+    # Make sure the calendar's holidays reach the furthest day any delta can
+    most_days = int(remaining.max() // open_hours) + 1
+    calendar = _busdaycalendar(
+        businesstime,
+        datetime.date.fromordinal(
+            businesstime._nth_businessday(
+                ordinals.min().item().toordinal() - 1, most_days, -1)),
+        datetime.date.fromordinal(
+            businesstime._nth_businessday(
+                ordinals.max().item().toordinal() + 1, most_days)))
+    isbusinessday = numpy.is_busday(ordinals, busdaycal=calendar)
+    one_day = numpy.timedelta64(1, 'D')
+
+    # Business time still left today in the direction of travel
+    forwards = direction > 0
+    today = numpy.where(
+        forwards,
+        numpy.where(isbusinessday & (time < closing),
+                    closing - numpy.maximum(time, opening), 0),
+        numpy.where(isbusinessday & (time > opening),
+                    numpy.minimum(time, closing) - opening, 0))
+    same_day = remaining <= today
+    same_day_time = numpy.where(forwards,
+                                numpy.maximum(time, opening) + remaining,
+                                numpy.minimum(time, closing) - remaining)
+
+    remaining = numpy.maximum(remaining - today, 1)
+    days, elapsed = numpy.divmod(remaining - 1, open_hours)
+    day = numpy.where(
+        forwards,
+        numpy.busday_offset(
+            ordinals + one_day, days, roll='forward', busdaycal=calendar),
+        numpy.busday_offset(
+            ordinals - one_day, -days, roll='backward', busdaycal=calendar))
+    day_time = numpy.where(forwards, opening + elapsed + 1,
+                           closing - elapsed - 1)
+
+    result = numpy.where(same_day, ordinals, day).astype('datetime64[us]')
+    result = result + numpy.where(same_day, same_day_time,
+                                  day_time).astype('timedelta64[us]')
+    return numpy.where(deltas == 0, dts, result)
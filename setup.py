@@ -27,5 +27,6 @@ setup(
     'A simple utility for calculating business time aware timedeltas between two datetimes',
     long_description=open('README.rst').read() + '\n\n' +
     open('CHANGES.rst').read(),
+    extras_require={'numpy': ['numpy']},
     tests_require=['nose'],
     test_suite='nose.collector')